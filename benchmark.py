@@ -0,0 +1,363 @@
+"""CSC148 Assignment 2
+
+=== CSC148 Winter 2020 ===
+Department of Computer Science,
+University of Toronto
+
+This code is provided solely for the personal and private use of
+students taking the CSC148 course at the University of Toronto.
+Copying for purposes other than this use is expressly prohibited.
+All forms of distribution of this code, whether as given or with
+any changes, are expressly prohibited.
+
+Authors: Diane Horton, David Liu, Mario Badr, Sophia Huynh, Misha Schwartz,
+and Jaisie Sin
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) Diane Horton, David Liu, Mario Badr, Sophia Huynh,
+Misha Schwartz, and Jaisie Sin
+
+=== Module Description ===
+
+This file contains benchmarks for the parts of the game that the computer
+players and simulations spend most of their time in. Run this file to print
+the results.
+"""
+from __future__ import annotations
+from typing import Callable, List, Optional, Tuple
+import gc
+import random
+import timeit
+
+from block import (Block, MoveJournal, NodeArena, all_blocks,
+                   generate_board, generate_boards)
+from goal import BlobGoal
+from moves import apply_moves, block_at
+from persistent import NodeStore, PersistentNode, persistent_board
+from raster import stack
+from settings import BOARD_SIZE, COLOUR_LIST
+
+# The depths of the boards that the benchmarks are run on.
+DEPTHS = [3, 4, 5, 6]
+
+
+def _best_time(stmt: Callable[[], object], number: int,
+               repeat: int = 3, collect: bool = False) -> float:
+    """Return the shortest time, in seconds, that one call to <stmt> took,
+    over <repeat> runs of <number> calls each.
+
+    Like timeit, the garbage collector is switched off while <stmt> runs,
+    unless <collect> is True.
+    """
+    setup = 'gc.enable()' if collect else 'pass'
+    return min(timeit.repeat(stmt, setup=setup, number=number,
+                             repeat=repeat)) / number
+
+
+def _collections(stmt: Callable[[], object]) -> int:
+    """Return the number of times the garbage collector ran during one call
+    to <stmt>, starting from no garbage.
+    """
+    gc.collect()
+    before = sum(stats['collections'] for stats in gc.get_stats())
+    stmt()
+    return sum(stats['collections'] for stats in gc.get_stats()) - before
+
+
+def _random_moves(num_blocks: int, count: int,
+                  seed: int) -> List[Tuple[int, str, Optional[int]]]:
+    """Return <count> random moves for a board with <num_blocks> blocks.
+
+    Each move is a tuple of the index of a block in pre-order, the name of
+    the move, and the direction of the move (or None).
+    """
+    rng = random.Random(seed)
+    moves = []
+    for _ in range(count):
+        action = rng.choice(['rotate', 'swap', 'smash', 'paint', 'combine'])
+        direction = None
+        if action == 'rotate':
+            direction = rng.choice([1, 3])
+        elif action == 'swap':
+            direction = rng.choice([0, 1])
+        moves.append((rng.randrange(num_blocks), action, direction))
+    return moves
+
+
+def _make_move(block: Block, action: str, direction: Optional[int],
+               journal: Optional[MoveJournal] = None) -> bool:
+    """Make the move <action> in <direction> on <block>, through <journal> if
+    it is not None.
+
+    Return True iff the move was performed.
+    """
+    target = block if journal is None else journal
+    args = [] if journal is None else [block]
+    if action in ('rotate', 'swap'):
+        args.append(direction)
+    elif action == 'paint':
+        args.append(COLOUR_LIST[0])
+    return getattr(target, action)(*args)
+
+
+def bench_copy_vs_journal(depths: List[int], num_moves: int = 200,
+                          seed: int = 0) -> List[Tuple[int, float, float]]:
+    """Return, for each depth in <depths>, the time it takes to try a move
+    on a copy of a random board and the time it takes to make the move and
+    undo it with a MoveJournal.
+
+    Each time is the average over <num_moves> random moves, in seconds.
+    """
+    results = []
+    for depth in depths:
+        random.seed(seed)
+        board = generate_board(depth, BOARD_SIZE)
+        blocks = all_blocks(board)
+        moves = _random_moves(len(blocks), num_moves, seed)
+
+        def try_on_copies() -> None:
+            for index, action, direction in moves:
+                copy = board.create_copy()
+                _make_move(all_blocks(copy)[index], action, direction)
+
+        def try_with_journal() -> None:
+            journal = MoveJournal()
+            for index, action, direction in moves:
+                _make_move(blocks[index], action, direction, journal)
+                journal.rollback()
+
+        copy_time = _best_time(try_on_copies, 1) / num_moves
+        journal_time = _best_time(try_with_journal, 1) / num_moves
+        results.append((depth, copy_time, journal_time))
+    return results
+
+
+def bench_generation(depths: List[int], num_boards: int = 1000,
+                     seed: int = 0) -> List[Tuple[int, float, float]]:
+    """Return, for each depth in <depths>, the time it takes to generate one
+    random board with generate_board and with generate_boards, when
+    <num_boards> boards are generated.
+
+    Each time is in seconds.
+    """
+    results = []
+    for depth in depths:
+
+        def one_at_a_time() -> None:
+            random.seed(seed)
+            for _ in range(num_boards):
+                generate_board(depth, BOARD_SIZE)
+
+        def in_bulk() -> None:
+            generate_boards(num_boards, depth, BOARD_SIZE, seed)
+
+        single_time = _best_time(one_at_a_time, 1) / num_boards
+        bulk_time = _best_time(in_bulk, 1) / num_boards
+        results.append((depth, single_time, bulk_time))
+    return results
+
+
+def bench_arena(depths: List[int], num_copies: int = 50,
+                seed: int = 0) -> List[Tuple[int, float, float, int, int]]:
+    """Return, for each depth in <depths>, the time it takes to make and
+    throw away a copy of a random board with create_copy, and with a
+    NodeArena that the copy is given back to, followed by the number of
+    times the garbage collector ran during <num_copies> copies made each
+    way.
+
+    Each time is the average over <num_copies> copies, in seconds. Copies
+    thrown away are freed by the garbage collector, so it is left on while
+    they are timed.
+    """
+    results = []
+    for depth in depths:
+        random.seed(seed)
+        board = generate_board(depth, BOARD_SIZE)
+        arena = NodeArena()
+
+        def with_create_copy() -> None:
+            for _ in range(num_copies):
+                board.create_copy()
+
+        def with_arena() -> None:
+            for _ in range(num_copies):
+                arena.release(arena.copy(board))
+
+        copy_time = _best_time(with_create_copy, 1, collect=True) / num_copies
+        arena_time = _best_time(with_arena, 1, collect=True) / num_copies
+        results.append((depth, copy_time, arena_time,
+                        _collections(with_create_copy),
+                        _collections(with_arena)))
+    return results
+
+
+def _all_paths(board: Block) -> List[Tuple[int, ...]]:
+    """Return the paths of all the blocks in <board>, in pre-order.
+    """
+    ans = [()]
+    for i, child in enumerate(board.children):
+        ans.extend((i,) + path for path in _all_paths(child))
+    return ans
+
+
+def bench_batches(depths: List[int], num_batches: int = 200,
+                  batch_size: int = 10,
+                  seed: int = 0) -> List[Tuple[int, float]]:
+    """Return, for each depth in <depths>, the number of moves per second
+    that apply_moves makes on a random board, over <num_batches> batches of
+    <batch_size> rotations and swaps of blocks with children, which are
+    undone after each batch.
+
+    A batch stops at the first move that cannot be made (when an earlier
+    swap has moved a leaf to the path of a later move), so only the moves
+    that were made before it, and then undone, are counted.
+    """
+    results = []
+    for depth in depths:
+        random.seed(seed)
+        board = generate_board(depth, BOARD_SIZE)
+        paths = [path for path in _all_paths(board)
+                 if len(block_at(board, path).children) != 0]
+        rng = random.Random(seed)
+        batches = [[(rng.choice(['rotate', 'swap']), None, rng.choice(paths))
+                    for _ in range(batch_size)] for _ in range(num_batches)]
+        for batch in batches:
+            for i, (action, _, path) in enumerate(batch):
+                direction = rng.choice([1, 3]) if action == 'rotate' \
+                    else rng.choice([0, 1])
+                batch[i] = (action, direction, path)
+
+        def run_batches() -> int:
+            journal = MoveJournal()
+            made = 0
+            for moves in batches:
+                failed = apply_moves(board, moves, COLOUR_LIST[0],
+                                     journal)[2]
+                made += len(moves) if failed is None else failed
+                journal.rollback()
+            return made
+
+        elapsed = _best_time(run_batches, 1)
+        results.append((depth, run_batches() / elapsed))
+    return results
+
+
+def _count_nodes(node: PersistentNode) -> int:
+    """Return the number of nodes in the tree rooted at <node>, counting a
+    shared node once for every place it appears.
+    """
+    return 1 + sum(_count_nodes(child) for child in node.children)
+
+
+def bench_node_sharing(depths: List[int], num_boards: int = 20,
+                       seed: int = 0) -> List[Tuple[int, int, int]]:
+    """Return, for each depth in <depths>, the number of nodes in
+    <num_boards> random boards, and the number of distinct nodes when they
+    are all kept in one NodeStore.
+    """
+    results = []
+    for depth in depths:
+        random.seed(seed)
+        store = NodeStore()
+        total = 0
+        for _ in range(num_boards):
+            board = generate_board(depth, BOARD_SIZE)
+            total += _count_nodes(persistent_board(board, store).root)
+        results.append((depth, total, len(store)))
+    return results
+
+
+def bench_score_many(depths: List[int], num_boards: int = 1000,
+                     seed: int = 0) -> List[Tuple[int, float, float]]:
+    """Return, for each depth in <depths>, the time it takes to score
+    <num_boards> random boards with a BlobGoal, by calling Goal.score on each
+    board, and by calling Goal.score_many once on a stack of their grids.
+
+    Each time is in seconds. Making the stack is not included.
+    """
+    results = []
+    for depth in depths:
+        boards = generate_boards(num_boards, depth, BOARD_SIZE, seed)
+        grids = stack(boards)
+        goal = BlobGoal(COLOUR_LIST[0])
+
+        def one_at_a_time() -> None:
+            for board in boards:
+                goal.score(board)
+
+        def in_a_batch() -> None:
+            goal.score_many(grids)
+
+        loop_time = _best_time(one_at_a_time, 1)
+        batch_time = _best_time(in_a_batch, 1)
+        results.append((depth, loop_time, batch_time))
+    return results
+
+
+def main() -> None:
+    """Run every benchmark and print the results.
+    """
+    print('Trying a move: create_copy vs. MoveJournal (microseconds)')
+    print(f'{"depth":>5} {"copy":>10} {"journal":>10} {"speedup":>8}')
+    for depth, copy_time, journal_time in bench_copy_vs_journal(DEPTHS):
+        print(f'{depth:>5} {copy_time * 1e6:>10.1f} '
+              f'{journal_time * 1e6:>10.1f} '
+              f'{copy_time / journal_time:>7.1f}x')
+
+    print()
+    print('Generating a board: generate_board vs. generate_boards '
+          '(microseconds)')
+    print(f'{"depth":>5} {"single":>10} {"bulk":>10} {"speedup":>8}')
+    for depth, single_time, bulk_time in bench_generation(DEPTHS):
+        print(f'{depth:>5} {single_time * 1e6:>10.1f} '
+              f'{bulk_time * 1e6:>10.1f} '
+              f'{single_time / bulk_time:>7.1f}x')
+
+    print()
+    print('Copying a board: create_copy vs. NodeArena (microseconds, and '
+          'garbage collections per 50 copies)')
+    print(f'{"depth":>5} {"copy":>10} {"arena":>10} {"speedup":>8} '
+          f'{"copy gc":>8} {"arena gc":>8}')
+    for depth, copy_time, arena_time, copy_runs, arena_runs in \
+            bench_arena(DEPTHS):
+        print(f'{depth:>5} {copy_time * 1e6:>10.1f} '
+              f'{arena_time * 1e6:>10.1f} '
+              f'{copy_time / arena_time:>7.1f}x '
+              f'{copy_runs:>8} {arena_runs:>8}')
+
+    print()
+    print('Applying moves in batches with apply_moves (moves per second)')
+    print(f'{"depth":>5} {"moves/s":>10}')
+    for depth, rate in bench_batches(DEPTHS):
+        print(f'{depth:>5} {rate:>10.0f}')
+
+    print()
+    print('Sharing identical subtrees in a NodeStore (nodes)')
+    print(f'{"depth":>5} {"nodes":>10} {"distinct":>10} {"ratio":>8}')
+    for depth, total, distinct in bench_node_sharing(DEPTHS):
+        print(f'{depth:>5} {total:>10} {distinct:>10} '
+              f'{total / distinct:>7.1f}x')
+
+    print()
+    print('Scoring 1000 boards: Goal.score vs. Goal.score_many '
+          '(milliseconds)')
+    print(f'{"depth":>5} {"loop":>10} {"batch":>10} {"speedup":>8}')
+    for depth, loop_time, batch_time in bench_score_many(DEPTHS):
+        print(f'{depth:>5} {loop_time * 1e3:>10.1f} '
+              f'{batch_time * 1e3:>10.1f} '
+              f'{loop_time / batch_time:>7.1f}x')
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'allowed-io': ['main'],
+        'allowed-import-modules': [
+            'doctest', 'python_ta', 'random', 'typing', 'timeit', 'gc',
+            '__future__', 'block', 'goal', 'moves', 'persistent', 'raster',
+            'settings'
+        ]
+    })
+
+    main()
@@ -1,412 +1,1428 @@
-"""CSC148 Assignment 2
-
-=== CSC148 Winter 2020 ===
-Department of Computer Science,
-University of Toronto
-
-This code is provided solely for the personal and private use of
-students taking the CSC148 course at the University of Toronto.
-Copying for purposes other than this use is expressly prohibited.
-All forms of distribution of this code, whether as given or with
-any changes, are expressly prohibited.
-
-Authors: Diane Horton, David Liu, Mario Badr, Sophia Huynh, Misha Schwartz,
-and Jaisie Sin
-
-All of the files in this directory and all subdirectories are:
-Copyright (c) Diane Horton, David Liu, Mario Badr, Sophia Huynh,
-Misha Schwartz, and Jaisie Sin
-
-=== Module Description ===
-
-This file contains the Block class, the main data structure used in the game.
-"""
-from __future__ import annotations
-from typing import Optional, Tuple, List
-import random
-import math
-
-from settings import colour_name, COLOUR_LIST
-
-
-def generate_board(max_depth: int, size: int) -> Block:
-    """Return a new game board with a depth of <max_depth> and dimensions of
-    <size> by <size>.
-
-    >>> board = generate_board(3, 750)
-    >>> board.max_depth
-    3
-    >>> board.size
-    750
-    >>> len(board.children) == 4
-    True
-    """
-    board = Block((0, 0), size, random.choice(COLOUR_LIST), 0, max_depth)
-    board.smash()
-
-    return board
-
-
-class Block:
-    """A square Block in the Blocky game, represented as a tree.
-
-    In addition to its tree-related attributes, a Block also contains attributes
-    that describe how the Block appears on a Cartesian plane. All positions
-    describe the upper left corner (x, y), and the origin is at (0, 0). All
-    positions and sizes are in the unit of pixels.
-
-    When a block has four children, the order of its children impacts each
-    child's position. Indices 0, 1, 2, and 3 are the upper-right child,
-    upper-left child, lower-left child, and lower-right child, respectively.
-
-    === Public Attributes ===
-    position:
-        The (x, y) coordinates of the upper left corner of this Block.
-    size:
-        The height and width of this square Block.
-    colour:
-        If this block is not subdivided, <colour> stores its colour. Otherwise,
-        <colour> is None.
-    level:
-        The level of this block within the overall block structure.
-        The outermost block, corresponding to the root of the tree,
-        is at level zero. If a block is at level i, its children are at
-        level i+1.
-    max_depth:
-        The deepest level allowed in the overall block structure.
-    children:
-        The blocks into which this block is subdivided. The children are
-        stored in this order: upper-right child, upper-left child,
-        lower-left child, lower-right child.
-
-    === Representation Invariants===
-    - len(children) == 0 or len(children) == 4
-    - If this Block has children:
-        - their max_depth is the same as that of this Block.
-        - their size is half that of this Block.
-        - their level is one greater than that of this Block.
-        - their position is determined by the position and size of this Block,
-          and their index in this Block's list of children.
-        - this Block's colour is None.
-    - If this Block has no children:
-        - its colour is not None.
-    - level <= max_depth
-    """
-    position: Tuple[int, int]
-    size: int
-    colour: Optional[Tuple[int, int, int]]
-    level: int
-    max_depth: int
-    children: List[Block]
-
-    def __init__(self, position: Tuple[int, int], size: int,
-                 colour: Optional[Tuple[int, int, int]], level: int,
-                 max_depth: int) -> None:
-        """Initialize this block with <position>, dimensions <size> by <size>,
-        the given <colour>, at <level>, and with no children.
-
-        Preconditions:
-            - position[0] >= 0 and position[1] >= 0
-            - size > 0
-            - level >= 0
-            - max_depth >= level
-        """
-        self.position = position
-        self.size = size
-        self.colour = colour
-        self.level = level
-        self.max_depth = max_depth
-        self.children = []
-
-    def __str__(self) -> str:
-        """Return this Block in a string format.
-
-        >>> block = Block((0, 0), 750, (0, 0, 0), 0, 1)
-        >>> str(block)
-        'Leaf: colour=, pos=(0, 0), size=750, level=0\\n'
-        """
-        if len(self.children) == 0:
-            indents = '\t' * self.level
-            colour = colour_name(self.colour)
-            return f'{indents}Leaf: colour={colour}, pos={self.position}, ' \
-                   f'size={self.size}, level={self.level}\n'
-        else:
-            indents = '\t' * self.level
-            result = f'{indents}Parent: pos={self.position},' \
-                     f'size={self.size}, level={self.level}\n'
-
-            for child in self.children:
-                result += str(child)
-
-            return result
-
-    def __eq__(self, other: Block) -> bool:
-        """Return True iff this Block and all its descendents are equivalent to
-        the <other> Block and all its descendents.
-        """
-        if len(self.children) == 0 and len(other.children) == 0:
-            # Both self and other are leaves.
-            return self.position == other.position and \
-                   self.size == other.size and \
-                   self.colour == other.colour and \
-                   self.level == other.level and \
-                   self.max_depth == other.max_depth
-        elif len(self.children) != len(other.children):
-            # One of self or other is a leaf while the other is not.
-            return False
-        else:
-            # Both self and other have four children.
-            for i in range(4):
-                # The != operator also uses the __eq__ special method.
-                if self.children[i] != other.children[i]:
-                    return False
-
-            return True
-
-    def _child_size(self) -> int:
-        """Return the size of this Block's children.
-        """
-        return round(self.size / 2.0)
-
-    def _children_positions(self) -> List[Tuple[int, int]]:
-        """Return the positions of this Block's four children.
-
-        The positions are returned in this order: upper-right child, upper-left
-        child, lower-left child, lower-right child.
-        """
-        x = self.position[0]
-        y = self.position[1]
-        size = self._child_size()
-
-        return [(x + size, y), (x, y), (x, y + size), (x + size, y + size)]
-
-    def _update_children_positions(self, position: Tuple[int, int]) -> None:
-        """Set the position of this Block to <position> and update all its
-        descendants to have positions consistent with this Block's.
-
-        <position> is the (x, y) coordinates of the upper-left corner of this
-        Block.
-        """
-        self.position = position
-        if len(self.children) != 0:
-            children_positions = self._children_positions()
-            for i in range(4):
-                self.children[i]._update_children_positions(
-                    children_positions[i])
-
-    def smashable(self) -> bool:
-        """Return True iff this block can be smashed.
-
-        A block can be smashed if it has no children and its level is not at
-        max_depth.
-        """
-        return self.level != self.max_depth and len(self.children) == 0
-
-    def _create_children_blocks(self) -> List[Block]:
-        """A helper function that returns a list of children blocks."""
-        ans = []
-        children_pos_lst = self._children_positions()
-        for i in range(4):
-            ans.append(Block(children_pos_lst[i],
-                             self._child_size(),
-                             random.choice(COLOUR_LIST),
-                             self.level + 1,
-                             self.max_depth))
-        return ans
-
-    def smash(self) -> bool:
-        """Sub-divide this block so that it has four randomly generated
-        children.
-
-        If this Block's level is <max_depth>, do nothing. If this block has
-        children, do nothing.
-        
-        Return True iff the smash was performed.
-        """
-        if not self.smashable():
-            return False
-        else:
-            self.colour = None
-            self.children = self._create_children_blocks()
-            for child in self.children:
-                if random.random() < math.exp(
-                        -0.25 * (self.level + 1)):
-                    child.smash()
-        return True
-
-    def swap(self, direction: int) -> bool:
-        """Swap the child Blocks of this Block.
-
-        If this Block has no children, do nothing. Otherwise, if <direction> is
-        1, swap vertically. If <direction> is 0, swap horizontally.
-        
-        Return True iff the swap was performed.
-
-        Precondition: <direction> is either 0 or 1
-        """
-        if len(self.children) == 0:
-            return False
-
-        elif direction == 0:
-            self.children = [self.children[1], self.children[0],
-                             self.children[3], self.children[2]]
-            self._update_children_positions(self.position)
-            return True
-
-        else:
-            self.children = [self.children[3], self.children[2],
-                             self.children[1], self.children[0]]
-            self._update_children_positions(self.position)
-            return True
-
-    def rotate(self, direction: int) -> bool:
-        """Rotate this Block and all its descendants.
-
-        If this Block has no children, do nothing. If <direction> is 1, rotate
-        clockwise. If <direction> is 3, rotate counter-clockwise.
-        
-        Return True iff the rotate was performed.
-
-        Precondition: <direction> is either 1 or 3.
-        """
-        if len(self.children) == 0:
-            return False
-        else:
-            if direction == 1:
-                self.children[0], self.children[1], \
-                self.children[2], self.children[3] \
-                    = self.children[1], self.children[2], \
-                      self.children[3], self.children[0]
-                self._update_children_positions(self.position)
-                for child in self.children:
-                    child.rotate(direction)
-            else:
-                self.children[0], self.children[1], \
-                self.children[2], self.children[3] \
-                    = self.children[3], self.children[0], \
-                      self.children[1], self.children[2]
-                self._update_children_positions(self.position)
-                for child in self.children:
-                    child.rotate(direction)
-            return True
-
-    def paint(self, colour: Tuple[int, int, int]) -> bool:
-        """Change this Block's colour iff it is a leaf at a level of max_depth
-        and its colour is different from <colour>.
-
-        Return True iff this Block's colour was changed.
-        """
-        if len(self.children) != 0 or \
-                self.level != self.max_depth or self.colour == colour:
-            return False
-        else:
-            self.colour = colour
-            return True
-
-    def combine(self) -> bool:
-        """Turn this Block into a leaf based on the majority colour of its
-        children.
-
-        The majority colour is the colour with the most child blocks of that
-        colour. A tie does not constitute a majority (e.g., if there are two red
-        children and two blue children, then there is no majority colour).
-
-        If there is no majority colour, do nothing. If this block is not at a
-        level of max_depth - 1, or this block has no children, do nothing.
-
-        Return True iff this Block was turned into a leaf node.
-        """
-        # When do we do nothing
-        if len(self.children) == 0:
-            return False
-        if self.level != (self.max_depth - 1):
-            return False
-        else:
-            maj = self._most_frequent()
-            if maj is not None:
-                self.children = []
-                self.colour = maj
-                return True
-            else:
-                return False
-
-    def _most_frequent(self) -> Optional[Tuple[int, int, int]]:
-        """Return the majority colour of self's children.
-
-        If there's no majority colour, return None.
-
-        Precondition: self has children.
-        """
-        colour_list = []
-        for child in self.children:
-            colour_list.append(child.colour)
-        counts = {}
-        colour_list_no_duplicates = list(
-            dict.fromkeys(colour_list))
-        for colour in colour_list_no_duplicates:
-            temp_count = colour_list.count(colour)
-            if temp_count not in counts:
-                counts[temp_count] = [colour]
-            else:
-                counts[temp_count].append(colour)
-        max_count = max(counts)
-        if len(counts[max_count]) == 1:
-            return counts[max_count][0]
-        else:
-            return None
-        # occur = counts.values()
-        # max_occur = max(occur)
-        # if max_occur == 1:
-        #     return None
-        # elif max_occur == 2:
-        #     if
-        #     else:
-        #         return
-        # elif max_occur == 3:
-        #     for colour in counts:
-        #         if counts[colour] == 3:
-        #             return colour
-        # if len(counts) == 4:
-        #     return None
-        # elif len(counts) == 3:
-        #     for colour in counts:
-        #         if counts[colour] == 2:
-        #             return colour
-        # elif len(counts) == 2:
-
-    def create_copy(self) -> Block:
-        """Return a new Block that is a deep copy of this Block.
-
-        Remember that a deep copy has new blocks (not aliases) at every level.
-        """
-        new = Block(self.position, self.size,
-                    self.colour, self.level, self.max_depth)
-        if len(self.children) == 0:
-            pass
-        else:
-            for child in self.children:
-                new.children.append(child.create_copy())
-        return new
-
-
-if __name__ == '__main__':
-    import python_ta
-
-    python_ta.check_all(config={
-        'allowed-import-modules': [
-            'doctest', 'python_ta', 'random', 'typing', '__future__', 'math',
-            'settings'
-        ],
-        'max-attributes': 15,
-        'max-args': 6
-    })
-
-    # This is a board consisting of only one block.
-    b1 = Block((0, 0), 750, COLOUR_LIST[0], 0, 1)
-    print("=== tiny board ===")
-    print(b1)
-
-    # Now let's make a random board.
-    b2 = generate_board(3, 750)
-    print("\n=== random board ===")
-    print(b2)
+"""CSC148 Assignment 2
+
+=== CSC148 Winter 2020 ===
+Department of Computer Science,
+University of Toronto
+
+This code is provided solely for the personal and private use of
+students taking the CSC148 course at the University of Toronto.
+Copying for purposes other than this use is expressly prohibited.
+All forms of distribution of this code, whether as given or with
+any changes, are expressly prohibited.
+
+Authors: Diane Horton, David Liu, Mario Badr, Sophia Huynh, Misha Schwartz,
+and Jaisie Sin
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) Diane Horton, David Liu, Mario Badr, Sophia Huynh,
+Misha Schwartz, and Jaisie Sin
+
+=== Module Description ===
+
+This file contains the Block class, the main data structure used in the game.
+"""
+from __future__ import annotations
+from typing import Callable, Optional, Tuple, List
+from functools import lru_cache
+import random
+import math
+
+from settings import colour_name, colour_index, COLOUR_LIST, PALETTE
+
+# A function that is told about each change to a Block it observes. It is
+# called with the name of the move, the path of child indices from the
+# observed Block to the Block that changed, and the (x, y, width, height)
+# of the area of the board that may look different.
+Observer = Callable[[str, Tuple[int, ...], Tuple[int, int, int, int]], None]
+
+# The order in which the children of a Block end up after a swap in each
+# direction, given as the old index of the child that lands at index 0, 1, 2
+# and 3.
+SWAP_ORDER = {0: (1, 0, 3, 2), 1: (3, 2, 1, 0)}
+
+# The children of every leaf. Most Blocks are leaves, so sharing one
+# immutable empty sequence saves an empty list per leaf.
+_NO_CHILDREN = ()
+
+
+def child_size(size: int) -> int:
+    """Return the size of the children of a Block of <size>.
+
+    Blocks on very deep boards would otherwise shrink to a size of 0, so no
+    Block is ever smaller than a single pixel. See child_positions for how
+    the children still fit on the board.
+
+    >>> child_size(750)
+    375
+    >>> child_size(1)
+    1
+    """
+    return max(1, round(size / 2.0))
+
+
+@lru_cache(maxsize=None)
+def child_offsets(size: int) -> Tuple[Tuple[int, int], ...]:
+    """Return the offsets of the upper left corners of the four children of a
+    Block of <size> from the upper left corner of that Block.
+
+    The offsets are returned in the same order as the children. The right
+    and lower children start child_size(size) pixels in, except that the
+    children of a Block of a single pixel all share that pixel instead of
+    starting past it.
+
+    >>> child_offsets(750)
+    ((375, 0), (0, 0), (0, 375), (375, 375))
+    >>> child_offsets(375)
+    ((188, 0), (0, 0), (0, 188), (188, 188))
+    >>> child_offsets(1)
+    ((0, 0), (0, 0), (0, 0), (0, 0))
+    """
+    far = child_size(size) if size >= 2 else 0
+    return (far, 0), (0, 0), (0, far), (far, far)
+
+
+def child_positions(position: Tuple[int, int], size: int,
+                    corner: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """Return the positions of the four children of a Block at <position> of
+    <size>, in the same order as the children, on a board whose lower right
+    corner is just before <corner>.
+
+    When rounding makes the children of a Block larger than half of it, the
+    right and lower children stick out of it by a pixel. On boards of depth
+    9 or more, these pixels add up until children along the right and lower
+    sides of the board would start past it. Such a child is moved back so
+    that its far side is against that side of the board. Every other child
+    is placed child_offsets(size) from <position>.
+
+    >>> child_positions((375, 375), 375, (750, 750))
+    [(563, 375), (375, 375), (375, 563), (563, 563)]
+    >>> child_positions((749, 0), 3, (750, 750))
+    [(748, 0), (749, 0), (749, 2), (748, 2)]
+
+    Even the deepest leaves of the deepest boards stay on the board:
+
+    >>> board = Block((0, 0), 750, (1, 128, 181), 0, 12)
+    >>> block = board
+    >>> while block.smash() or len(block.children) != 0:
+    ...     block = block.children[3]
+    >>> block.level
+    12
+    >>> x, y = block.position
+    >>> x + block.size <= 750 and y + block.size <= 750
+    True
+    """
+    size_of_child = child_size(size)
+    ans = []
+    for dx, dy in child_offsets(size):
+        x = position[0] + dx
+        y = position[1] + dy
+        if x >= corner[0]:
+            x = corner[0] - size_of_child
+        if y >= corner[1]:
+            y = corner[1] - size_of_child
+        ans.append((x, y))
+    return ans
+
+
+def majority_colour(colours: List[int]) -> Optional[int]:
+    """Return the colour that occurs strictly more often in <colours> than
+    any other colour, or None if there is no such colour.
+
+    Precondition: len(colours) > 0
+
+    >>> majority_colour([2, 1, 2, 3])
+    2
+    >>> majority_colour([2, 1, 2, 1]) is None
+    True
+    """
+    counts = {}
+    for colour in colours:
+        counts[colour] = counts.get(colour, 0) + 1
+    max_count = max(counts.values())
+    winners = [colour for colour in counts if counts[colour] == max_count]
+    if len(winners) != 1:
+        return None
+    return winners[0]
+
+
+def generate_board(max_depth: int, size: int,
+                   arena: Optional[NodeArena] = None) -> Block:
+    """Return a new game board with a depth of <max_depth> and dimensions of
+    <size> by <size>.
+
+    If <arena> is not None, the board's Blocks come from <arena>, and so do
+    any Blocks created when it is smashed later on.
+
+    >>> board = generate_board(3, 750)
+    >>> board.max_depth
+    3
+    >>> board.size
+    750
+    >>> len(board.children) == 4
+    True
+    """
+    if arena is None:
+        board = Block((0, 0), size, random.choice(COLOUR_LIST), 0, max_depth)
+    else:
+        board = arena.acquire((0, 0), size, random.choice(COLOUR_LIST), 0,
+                              max_depth)
+    board.smash()
+
+    return board
+
+
+def generate_boards(n: int, max_depth: int, size: int,
+                    seed: int = 0) -> List[Block]:
+    """Return <n> new random game boards with a depth of <max_depth> and
+    dimensions of <size> by <size>.
+
+    The boards are smashed the same way as by generate_board, but they are
+    built one level at a time for all <n> boards together, so the colours and
+    smash decisions for a whole level are drawn in one batch. The random
+    numbers come from a generator seeded with <seed> instead of the global
+    random state, so the same (n, max_depth, size, seed) always gives the
+    same boards.
+
+    >>> boards = generate_boards(3, 2, 750, seed=148)
+    >>> len(boards)
+    3
+    >>> boards == generate_boards(3, 2, 750, seed=148)
+    True
+    >>> all(len(board.children) == 4 for board in boards)
+    True
+    """
+    rng = random.Random(seed)
+    draw = rng.random
+    palette = [colour_index(colour) for colour in COLOUR_LIST]
+    boards = [Block((0, 0), size, None, 0, max_depth) for _ in range(n)]
+    if max_depth == 0:
+        for board, colour in zip(boards, rng.choices(palette, k=n)):
+            board._colour = colour
+        return boards
+
+    level = 0
+    parent_size = size
+    frontier = boards
+    while len(frontier) != 0:
+        size_of_child = child_size(parent_size)
+        colours = rng.choices(palette, k=4 * len(frontier))
+        children = []
+        for child_colour in colours:
+            child = Block((0, 0), size_of_child, None, level + 1, max_depth)
+            child._colour = child_colour
+            children.append(child)
+        # The parents are new and have no children yet, so there is nothing
+        # for the children setter to settle: link them directly.
+        for i, parent in enumerate(frontier):
+            parent._children = children[4 * i:4 * i + 4]
+            for child in parent._children:
+                child._parent = parent
+
+        level += 1
+        parent_size = size_of_child
+        if level == max_depth:
+            frontier = []
+        else:
+            chance = math.exp(-0.25 * level)
+            frontier = [child for child in children if draw() < chance]
+            for child in frontier:
+                child._colour = None
+    return boards
+
+
+def all_blocks(board: Block) -> List[Block]:
+    """Return <board> and all its descendants, in pre-order.
+
+    >>> board = Block((0, 0), 750, COLOUR_LIST[0], 0, 1)
+    >>> board.smash()
+    True
+    >>> len(all_blocks(board))
+    5
+    """
+    ans = [board]
+    for child in board.children:
+        ans.extend(all_blocks(child))
+    return ans
+
+
+class Block:
+    """A square Block in the Blocky game, represented as a tree.
+
+    In addition to its tree-related attributes, a Block also contains attributes
+    that describe how the Block appears on a Cartesian plane. All positions
+    describe the upper left corner (x, y), and the origin is at (0, 0). All
+    positions and sizes are in the unit of pixels.
+
+    When a block has four children, the order of its children impacts each
+    child's position. Indices 0, 1, 2, and 3 are the upper-right child,
+    upper-left child, lower-left child, and lower-right child, respectively.
+
+    === Public Attributes ===
+    position:
+        The (x, y) coordinates of the upper left corner of this Block. The
+        position of a child Block is not stored: it is worked out when needed
+        from the child's index among its parent's children, so moves that
+        reorder children never have to update the positions of descendants.
+    size:
+        The height and width of this square Block.
+    colour:
+        If this block is not subdivided, <colour> stores its colour. Otherwise,
+        <colour> is None.
+    colour_index:
+        The index of <colour> in settings.PALETTE, or None if <colour> is
+        None. This is what the Block actually stores.
+    level:
+        The level of this block within the overall block structure.
+        The outermost block, corresponding to the root of the tree,
+        is at level zero. If a block is at level i, its children are at
+        level i+1.
+    max_depth:
+        The deepest level allowed in the overall block structure.
+    children:
+        The blocks into which this block is subdivided. The children are
+        stored in this order: upper-right child, upper-left child,
+        lower-left child, lower-right child.
+
+    === Representation Invariants===
+    - len(children) == 0 or len(children) == 4
+    - If this Block has children:
+        - their max_depth is the same as that of this Block.
+        - their size is half that of this Block.
+        - their level is one greater than that of this Block.
+        - their position is determined by the position and size of this Block,
+          and their index in this Block's list of children.
+        - this Block's colour is None.
+    - If this Block has no children:
+        - its colour is not None.
+    - level <= max_depth
+    """
+    # === Private Attributes ===
+    # _colour:
+    #   The index of this Block's colour in settings.PALETTE, or None if this
+    #   Block has children.
+    # _origin:
+    #   The position of this Block when it has no parent.
+    # _parent:
+    #   The Block whose children include this Block, or None.
+    # _children:
+    #   The children of this Block, before <_turn> is applied to them. Every
+    #   leaf shares the empty tuple _NO_CHILDREN instead of having an empty
+    #   list of its own.
+    # _turn:
+    #   The number of clockwise quarter turns that this Block and all its
+    #   descendants have been rotated by, but that have not been applied to
+    #   <_children> yet. Turns are only pushed down one level at a time, when
+    #   the children are read, so a rotation takes constant time and opposite
+    #   rotations cancel out without touching the subtree.
+    # _hash:
+    #   None, or a structural hash of this Block and its descendants for each
+    #   of the four ways they can be turned, computed from <_children> before
+    #   <_turn> is applied. It is cleared whenever this Block or one of its
+    #   descendants changes, so if it is None, it is also None for every
+    #   ancestor.
+    # _arena:
+    #   The NodeArena that the children of this Block are taken from when it
+    #   is smashed, and given back to when it is combined, or None if they
+    #   are created and freed normally.
+    # _version:
+    #   The number of moves made on this Block and its descendants.
+    # _observers:
+    #   The functions to tell about each move made on this Block or its
+    #   descendants, or None if there are none.
+    #
+    # Blocks are created in large numbers, so they use __slots__ instead of a
+    # per-instance __dict__.
+    __slots__ = ('_origin', 'size', '_colour', 'level', 'max_depth',
+                 '_parent', '_children', '_turn', '_hash', '_arena',
+                 '_version', '_observers')
+    position: Tuple[int, int]
+    size: int
+    colour: Optional[Tuple[int, int, int]]
+    level: int
+    max_depth: int
+    children: List[Block]
+
+    def __init__(self, position: Tuple[int, int], size: int,
+                 colour: Optional[Tuple[int, int, int]], level: int,
+                 max_depth: int) -> None:
+        """Initialize this block with <position>, dimensions <size> by <size>,
+        the given <colour>, at <level>, and with no children.
+
+        Raise a ValueError if <colour> is not None and not in settings.PALETTE.
+
+        Preconditions:
+            - position[0] >= 0 and position[1] >= 0
+            - size > 0
+            - level >= 0
+            - max_depth >= level
+        """
+        self._origin = position
+        self._parent = None
+        self._hash = None
+        self._arena = None
+        self._version = 0
+        self._observers = None
+        self.size = size
+        self._colour = None if colour is None else colour_index(colour)
+        self.level = level
+        self.max_depth = max_depth
+        self._children = _NO_CHILDREN
+        self._turn = 0
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        """The (x, y) coordinates of the upper left corner of this Block.
+        """
+        path = []
+        block = self
+        while block._parent is not None:
+            path.append(block)
+            block = block._parent
+
+        # Walk back down from the root, so that any pending turns of the
+        # ancestors are applied before the index of each Block is looked up.
+        x, y = block._origin
+        corner = (x + block.size, y + block.size)
+        for block in reversed(path):
+            siblings = block._parent._turned_children()
+            index = 0
+            while index < len(siblings) and siblings[index] is not block:
+                index += 1
+            if index == len(siblings):
+                # <block> has been removed from its parent's children
+                x, y = block._origin
+            else:
+                x, y = child_positions((x, y), block._parent.size,
+                                       corner)[index]
+        return x, y
+
+    @position.setter
+    def position(self, position: Tuple[int, int]) -> None:
+        """Set the position of this Block to <position>.
+
+        This only has an effect on a Block with no parent, since the position
+        of a child Block is determined by its parent.
+        """
+        self._origin = position
+
+    @property
+    def children(self) -> List[Block]:
+        """The blocks into which this block is subdivided.
+
+        The turns still pending on this Block and on all its ancestors are
+        applied first, so the children are in the order they are on the
+        board, even if this Block was reached before an ancestor was rotated:
+
+        >>> board = Block((0, 0), 750, None, 0, 2)
+        >>> board.children = [Block((0, 0), 375, None, 1, 2)
+        ...                   for _ in range(4)]
+        >>> block = board.children[0]
+        >>> block.children = [Block((0, 0), 188, colour, 2, 2)
+        ...                   for colour in COLOUR_LIST]
+        >>> board.rotate(1)
+        True
+        >>> [child.colour_index for child in block.children]
+        [1, 2, 3, 0]
+        >>> [child.colour_index for child in block.create_copy().children]
+        [1, 2, 3, 0]
+        """
+        self._settle()
+        return self._turned_children()
+
+    def _turned_children(self) -> List[Block]:
+        """Return the children of this Block, after applying its own pending
+        turns to them.
+
+        The children are only in the order they are on the board if no
+        ancestor of this Block has a turn pending, so this is for walking
+        down from a Block whose ancestors have already been settled.
+        """
+        if self._turn != 0:
+            self._apply_turn()
+        return self._children
+
+    @children.setter
+    def children(self, children: List[Block]) -> None:
+        """Set the children of this Block to <children>.
+
+        Any former child that is not in <children> keeps its current position
+        as its own.
+        """
+        # Looking up the position of a former child reads the children of
+        # this Block again, so loop over a copy of them.
+        for child in list(self.children):
+            if all(child is not new for new in children):
+                child._origin = child.position
+                child._parent = None
+        if len(children) == 0:
+            children = _NO_CHILDREN
+        self._children = children
+        self._turn = 0
+        for child in children:
+            child._parent = self
+        self._invalidate()
+
+    def _settle(self) -> None:
+        """Apply the pending turns of all of this Block's ancestors, so that
+        any turn still to come from above has reached this Block.
+
+        Until then, the order of this Block's children is missing those
+        turns. This must also be done before the children of this Block are
+        replaced or reordered: otherwise a turn that was meant for the old
+        children would later be applied to the new ones.
+        """
+        # Find the highest ancestor with a turn pending. Usually there is none,
+        # so nothing else is done.
+        top = None
+        block = self._parent
+        while block is not None:
+            if block._turn != 0:
+                top = block
+            block = block._parent
+        if top is None:
+            return
+
+        ancestors = []
+        block = self._parent
+        while block is not top:
+            ancestors.append(block)
+            block = block._parent
+        top._apply_turn()
+        for block in reversed(ancestors):
+            if block._turn != 0:
+                block._apply_turn()
+
+    def _apply_turn(self) -> None:
+        """Apply this Block's pending turns to the order of its children, and
+        pass the turns on to the children.
+        """
+        turn = self._turn
+        self._turn = 0
+        children = self._children
+        children[:] = [children[(i + turn) % 4] for i in range(4)]
+        for child in children:
+            if len(child._children) != 0:
+                child._turn = (child._turn + turn) % 4
+        if self._hash is not None:
+            # The children now hold the turn, so what used to be the hash for
+            # <turn> turns is the hash for no turns, and so on.
+            self._hash = self._hash[turn:] + self._hash[:turn]
+
+    @property
+    def version(self) -> int:
+        """The number of moves that have been made on this Block and its
+        descendants.
+
+        A cache of anything computed from this Block is still up to date as
+        long as this number has not changed.
+        """
+        return self._version
+
+    def add_observer(self, observer: Observer) -> None:
+        """Tell <observer> about every move made on this Block or any of its
+        descendants from now on.
+
+        The observer is called after each move with the name of the move, the
+        path of child indices from this Block to the Block it was made on,
+        and the (x, y, width, height) of the area of the board that it may
+        have changed. Undoing a smash, paint or combine with a MoveJournal is
+        reported as an 'undo'.
+
+        The path and area are where the Block is on the board when the move
+        is made, even if it was reached before one of its ancestors was
+        rotated:
+
+        >>> board = Block((0, 0), 750, None, 0, 2)
+        >>> board.children = [Block((0, 0), 375, None, 1, 2)
+        ...                   for _ in range(4)]
+        >>> for child in board.children:
+        ...     child.children = [Block((0, 0), 188, COLOUR_LIST[0], 2, 2)
+        ...                       for _ in range(4)]
+        >>> block = board.children[0]
+        >>> leaf = block.children[0]
+        >>> board.add_observer(lambda *change: print(change))
+        >>> board.rotate(1)
+        ('rotate', (), (0, 0, 750, 750))
+        True
+        >>> block.rotate(1)
+        ('rotate', (3,), (375, 375, 375, 375))
+        True
+        >>> leaf.paint(COLOUR_LIST[1])
+        ('paint', (3, 2), (375, 563, 188, 188))
+        True
+        >>> leaf.position
+        (375, 563)
+        """
+        if self._observers is None:
+            self._observers = []
+        self._observers.append(observer)
+
+    def remove_observer(self, observer: Observer) -> None:
+        """Stop telling <observer> about the moves made on this Block.
+
+        Precondition: <observer> was added to this Block.
+        """
+        self._observers.remove(observer)
+        if len(self._observers) == 0:
+            self._observers = None
+
+    def _changed(self, action: str) -> None:
+        """Record that the move <action> was just made on this Block.
+
+        The version of this Block and all its ancestors goes up by one, and
+        the observers of each of them are told about the move.
+        """
+        chain = []
+        block = self
+        while block is not None:
+            block._version += 1
+            chain.append(block)
+            block = block._parent
+        if all(block._observers is None for block in chain):
+            return
+
+        # Walk back down from the root, applying any turns still pending on
+        # the way, to find the index of each Block of <chain> among its
+        # parent's children and the position of this Block on the board.
+        path = []
+        x, y = chain[-1]._origin
+        corner = (x + chain[-1].size, y + chain[-1].size)
+        for i in range(len(chain) - 1, 0, -1):
+            siblings = chain[i]._turned_children()
+            index = next(k for k in range(len(siblings))
+                         if siblings[k] is chain[i - 1])
+            path.append(index)
+            x, y = child_positions((x, y), chain[i].size, corner)[index]
+        box = (x, y, self.size, self.size)
+        for i, block in enumerate(chain):
+            if block._observers is not None:
+                for observer in list(block._observers):
+                    observer(action, tuple(path[len(path) - i:]), box)
+
+    def _invalidate(self) -> None:
+        """Clear the structural hash of this Block and all its ancestors.
+        """
+        block = self
+        while block is not None and block._hash is not None:
+            block._hash = None
+            block = block._parent
+
+    def _hashes(self) -> Tuple[int, int, int, int]:
+        """Return the structural hash of this Block and its descendants for
+        each of the four ways they can be turned, before <_turn> is applied.
+        """
+        if self._hash is None:
+            base = (self.size, self.level, self.max_depth, self._colour)
+            if len(self._children) == 0:
+                value = hash(base)
+                self._hash = (value, value, value, value)
+            else:
+                kids = [(child._hashes(), child._turn)
+                        for child in self._children]
+                self._hash = tuple(
+                    hash(base + tuple(
+                        kids[(i + turn) % 4][0][(kids[(i + turn) % 4][1] +
+                                                 turn) % 4]
+                        for i in range(4)))
+                    for turn in range(4))
+        return self._hash
+
+    def __hash__(self) -> int:
+        """Return a hash of this Block and all its descendants.
+
+        The hash is kept up to date as the Block changes, so it takes constant
+        time unless part of the Block has changed since it was last computed.
+        Equal Blocks have equal hashes. Like any mutable key, a Block that is
+        used as a dictionary key must not be changed while it is in the
+        dictionary.
+
+        Rotations that are still pending at any level give the same hash as a
+        copy of the board, in which every turn has been applied:
+
+        >>> random.seed(7)
+        >>> agree = []
+        >>> for board in generate_boards(20, 4, 750, seed=7):
+        ...     blocks = all_blocks(board)
+        ...     for _ in range(10):
+        ...         _ = random.choice(blocks).rotate(random.choice([1, 3]))
+        ...         agree.append(hash(board) == hash(board.create_copy()))
+        >>> all(agree)
+        True
+        """
+        self._settle()
+        return self._hashes()[self._turn]
+
+    @property
+    def colour(self) -> Optional[Tuple[int, int, int]]:
+        """The colour of this Block, or None if it has children.
+        """
+        if self._colour is None:
+            return None
+        return PALETTE[self._colour]
+
+    @colour.setter
+    def colour(self, colour: Optional[Tuple[int, int, int]]) -> None:
+        """Set the colour of this Block to <colour>.
+        """
+        if colour is None:
+            self._colour = None
+        else:
+            self._colour = colour_index(colour)
+        self._invalidate()
+
+    @property
+    def colour_index(self) -> Optional[int]:
+        """The index of this Block's colour in settings.PALETTE, or None if it
+        has children.
+        """
+        return self._colour
+
+    def __str__(self) -> str:
+        """Return this Block in a string format.
+
+        >>> block = Block((0, 0), 750, (0, 0, 0), 0, 1)
+        >>> str(block)
+        'Leaf: colour=, pos=(0, 0), size=750, level=0\\n'
+        """
+        if len(self.children) == 0:
+            indents = '\t' * self.level
+            colour = colour_name(self.colour)
+            return f'{indents}Leaf: colour={colour}, pos={self.position}, ' \
+                   f'size={self.size}, level={self.level}\n'
+        else:
+            indents = '\t' * self.level
+            result = f'{indents}Parent: pos={self.position},' \
+                     f'size={self.size}, level={self.level}\n'
+
+            for child in self.children:
+                result += str(child)
+
+            return result
+
+    def __eq__(self, other: Block) -> bool:
+        """Return True iff this Block and all its descendents are equivalent to
+        the <other> Block and all its descendents.
+        """
+        if self is other:
+            return True
+        if isinstance(other, Block) and self._hash is not None and \
+                other._hash is not None and hash(self) != hash(other):
+            # Blocks with different structural hashes cannot be equivalent.
+            # The hashes are only compared when both are already known, since
+            # working one out takes as long as comparing the Blocks.
+            return False
+        # The positions of the descendants follow from the position of the
+        # Block they are in, so they only need to be compared once, here.
+        self._settle()
+        return self.position == other.position and self._same_as(other)
+
+    def _same_as(self, other: Block) -> bool:
+        """Return True iff this Block and all its descendents are equivalent to
+        the <other> Block and all its descendents, apart from their positions.
+
+        Precondition: no ancestor of this Block has a turn pending.
+        """
+        children = self._turned_children()
+        if len(children) == 0 and len(other.children) == 0:
+            # Both self and other are leaves.
+            return self.size == other.size and \
+                   self._colour == other.colour_index and \
+                   self.level == other.level and \
+                   self.max_depth == other.max_depth
+        elif len(children) != len(other.children) or \
+                self.size != other.size:
+            # One of self or other is a leaf while the other is not, or their
+            # children are laid out differently.
+            return False
+        else:
+            # Both self and other have four children.
+            for i in range(4):
+                if not children[i]._same_as(other.children[i]):
+                    return False
+
+            return True
+
+    def _child_size(self) -> int:
+        """Return the size of this Block's children.
+        """
+        return child_size(self.size)
+
+    def _children_positions(self) -> List[Tuple[int, int]]:
+        """Return the positions of this Block's four children.
+
+        The positions are returned in this order: upper-right child, upper-left
+        child, lower-left child, lower-right child.
+        """
+        root = self
+        while root._parent is not None:
+            root = root._parent
+        x, y = root.position
+        return child_positions(self.position, self.size,
+                               (x + root.size, y + root.size))
+
+    def _update_children_positions(self, position: Tuple[int, int]) -> None:
+        """Set the position of this Block to <position> and update all its
+        descendants to have positions consistent with this Block's.
+
+        <position> is the (x, y) coordinates of the upper-left corner of this
+        Block. Since the positions of descendants are derived from this
+        Block's, this takes constant time.
+        """
+        self.position = position
+
+    def smashable(self) -> bool:
+        """Return True iff this block can be smashed.
+
+        A block can be smashed if it has no children and its level is not at
+        max_depth.
+        """
+        return self.level != self.max_depth and len(self.children) == 0
+
+    def combinable(self) -> bool:
+        """Return True iff this block can be combined.
+
+        A block can be combined if it has children, its level is
+        max_depth - 1, and its children have a majority colour.
+        """
+        return len(self.children) != 0 and \
+            self.level == self.max_depth - 1 and \
+            self._most_frequent() is not None
+
+    def _create_children_blocks(self) -> List[Block]:
+        """A helper function that returns a list of children blocks.
+
+        The children are created at (0, 0), since their positions follow from
+        this Block's once they are its children.
+        """
+        ans = []
+        size_of_child = self._child_size()
+        for _ in range(4):
+            if self._arena is None:
+                ans.append(Block((0, 0),
+                                 size_of_child,
+                                 random.choice(COLOUR_LIST),
+                                 self.level + 1,
+                                 self.max_depth))
+            else:
+                ans.append(self._arena.acquire((0, 0),
+                                               size_of_child,
+                                               random.choice(COLOUR_LIST),
+                                               self.level + 1,
+                                               self.max_depth))
+        return ans
+
+    def smash(self) -> bool:
+        """Sub-divide this block so that it has four randomly generated
+        children.
+
+        If this Block's level is <max_depth>, do nothing. If this block has
+        children, do nothing.
+        
+        Return True iff the smash was performed.
+        """
+        if not self.smashable():
+            return False
+        else:
+            self._subdivide()
+            self._changed('smash')
+        return True
+
+    def _subdivide(self) -> None:
+        """Smash this Block as described in smash, without telling anyone
+        about it.
+
+        Precondition: self.smashable()
+        """
+        self.colour = None
+        self.children = self._create_children_blocks()
+        for child in self.children:
+            if random.random() < math.exp(
+                    -0.25 * (self.level + 1)) and child.smashable():
+                child._subdivide()
+
+    def swap(self, direction: int) -> bool:
+        """Swap the child Blocks of this Block.
+
+        If this Block has no children, do nothing. Otherwise, if <direction> is
+        1, swap vertically. If <direction> is 0, swap horizontally.
+        
+        Return True iff the swap was performed.
+
+        Precondition: <direction> is either 0 or 1
+        """
+        children = self.children
+        if len(children) == 0:
+            return False
+
+        else:
+            self.children = [children[k] for k in SWAP_ORDER[direction]]
+            self._changed('swap')
+            return True
+
+    def rotate(self, direction: int) -> bool:
+        """Rotate this Block and all its descendants.
+
+        If this Block has no children, do nothing. If <direction> is 1, rotate
+        clockwise. If <direction> is 3, rotate counter-clockwise.
+        
+        Return True iff the rotate was performed.
+
+        The rotation is recorded as a pending turn on this Block, and is only
+        applied to its descendants as they are read, so this takes constant
+        time. Turns pending on the ancestors need not be applied first, since
+        rotations of the same Block can be made in any order.
+
+        Precondition: <direction> is either 1 or 3.
+        """
+        if len(self._children) == 0:
+            return False
+        else:
+            # Rotating counter-clockwise is the same as three clockwise turns.
+            self._turn = (self._turn + direction) % 4
+            if self._parent is not None:
+                self._parent._invalidate()
+            self._changed('rotate')
+            return True
+
+    def paint(self, colour: Tuple[int, int, int]) -> bool:
+        """Change this Block's colour iff it is a leaf at a level of max_depth
+        and its colour is different from <colour>.
+
+        Return True iff this Block's colour was changed.
+        """
+        index = colour_index(colour)
+        if len(self.children) != 0 or \
+                self.level != self.max_depth or self._colour == index:
+            return False
+        else:
+            self._colour = index
+            self._invalidate()
+            self._changed('paint')
+            return True
+
+    def combine(self) -> bool:
+        """Turn this Block into a leaf based on the majority colour of its
+        children.
+
+        The majority colour is the colour with the most child blocks of that
+        colour. A tie does not constitute a majority (e.g., if there are two red
+        children and two blue children, then there is no majority colour).
+
+        If there is no majority colour, do nothing. If this block is not at a
+        level of max_depth - 1, or this block has no children, do nothing.
+
+        Return True iff this Block was turned into a leaf node.
+        """
+        children = self.children
+        if not self._merge():
+            return False
+        if self._arena is not None:
+            for child in children:
+                self._arena.release(child)
+        return True
+
+    def _merge(self) -> bool:
+        """Combine this Block as described in combine, but without giving its
+        old children back to its arena.
+
+        Return True iff this Block was turned into a leaf node.
+        """
+        # When do we do nothing
+        if len(self.children) == 0:
+            return False
+        if self.level != (self.max_depth - 1):
+            return False
+        else:
+            maj = self._most_frequent()
+            if maj is not None:
+                self.children = []
+                self._colour = maj
+                self._invalidate()
+                self._changed('combine')
+                return True
+            else:
+                return False
+
+    def _most_frequent(self) -> Optional[int]:
+        """Return the palette index of the majority colour of self's children.
+
+        If there's no majority colour, return None.
+
+        Precondition: self has children.
+        """
+        return majority_colour([child.colour_index
+                                for child in self.children])
+
+    def create_copy(self) -> Block:
+        """Return a new Block that is a deep copy of this Block.
+
+        Remember that a deep copy has new blocks (not aliases) at every level.
+        """
+        self._settle()
+        new = Block(self.position, self.size, None, self.level,
+                    self.max_depth)
+        new._colour = self._colour
+        self._copy_children(new)
+        return new
+
+    def _copy_children(self, new: Block) -> None:
+        """Give <new> deep copies of the children of this Block.
+
+        The copies are linked to <new> directly instead of through the
+        children setter: they are new, so there are no turns or hashes to
+        settle, and their positions follow from the position of <new>.
+
+        Precondition: <new> is a new leaf, and no ancestor of this Block has a
+        turn pending.
+        """
+        children = self._turned_children()
+        if len(children) == 0:
+            return
+        copies = []
+        for child in children:
+            copy = Block((0, 0), child.size, None, child.level,
+                         child.max_depth)
+            copy._colour = child._colour
+            copy._parent = new
+            child._copy_children(copy)
+            copies.append(copy)
+        new._children = copies
+
+
+class MoveJournal:
+    """A record of the moves made on Blocks, which can be undone exactly.
+
+    Each move is made through the journal instead of directly on the Block.
+    For every move that succeeds, the journal records just enough to reverse
+    it, so a caller can try a move, look at the result, and roll the board
+    back instead of trying the move on a copy of the board. Rolling back
+    restores the very same Block objects that were there before the moves.
+
+    Undoing any one move gives back a board equal to a copy taken before it:
+
+    >>> moves = [('smash',), ('swap', 0), ('swap', 1), ('rotate', 1),
+    ...          ('rotate', 3), ('paint', COLOUR_LIST[0]), ('combine',)]
+    >>> performed = {move: 0 for move in moves}
+    >>> journal = MoveJournal()
+    >>> wrong = []
+    >>> for board in generate_boards(5, 3, 750, seed=6):
+    ...     snapshot = board.create_copy()
+    ...     for block in all_blocks(board):
+    ...         for move in moves:
+    ...             if getattr(journal, move[0])(block, *move[1:]):
+    ...                 performed[move] += 1
+    ...                 journal.undo()
+    ...             if board != snapshot or hash(board) != hash(snapshot):
+    ...                 wrong.append(move)
+    >>> wrong
+    []
+    >>> all(count > 0 for count in performed.values())
+    True
+
+    Rolling back many moves at once gives back the same Blocks as before:
+
+    >>> board = generate_boards(1, 4, 750, seed=7)[0]
+    >>> snapshot = board.create_copy()
+    >>> before = [id(block) for block in all_blocks(board)]
+    >>> random.seed(0)
+    >>> for _ in range(50):
+    ...     move = random.choice(moves)
+    ...     block = random.choice(all_blocks(board))
+    ...     _ = getattr(journal, move[0])(block, *move[1:])
+    >>> len(journal) > 10 and board != snapshot
+    True
+    >>> journal.rollback()
+    >>> board == snapshot and hash(board) == hash(snapshot)
+    True
+    >>> [id(block) for block in all_blocks(board)] == before
+    True
+    """
+    # === Private Attributes ===
+    # _entries:
+    #   For each successful move, oldest first, a tuple of the name of the
+    #   move, the Block it was made on, and what is needed to reverse it:
+    #   - 'smash': the palette index of the Block's colour before the smash
+    #   - 'swap': the direction of the swap
+    #   - 'rotate': the direction of the rotation
+    #   - 'paint': the palette index of the Block's colour before painting
+    #   - 'combine': the children of the Block before the combine
+    _entries: List[Tuple[str, Block, object]]
+
+    def __init__(self) -> None:
+        """Initialize this journal with no moves recorded.
+        """
+        self._entries = []
+
+    def __len__(self) -> int:
+        """Return the number of moves recorded in this journal.
+        """
+        return len(self._entries)
+
+    def __del__(self) -> None:
+        """Forget every move recorded in this journal, as clear does, when
+        the journal itself is no longer used.
+
+        Otherwise, the children that combined Blocks had before they were
+        combined would never be given back to their arena.
+        """
+        self.clear()
+
+    def smash(self, block: Block) -> bool:
+        """Smash <block> and record the move if it was performed.
+
+        Return True iff the smash was performed.
+        """
+        colour = block.colour_index
+        if not block.smash():
+            return False
+        self._entries.append(('smash', block, colour))
+        return True
+
+    def swap(self, block: Block, direction: int) -> bool:
+        """Swap the children of <block> in <direction> and record the move if
+        it was performed.
+
+        Return True iff the swap was performed.
+        """
+        if not block.swap(direction):
+            return False
+        self._entries.append(('swap', block, direction))
+        return True
+
+    def rotate(self, block: Block, direction: int) -> bool:
+        """Rotate <block> in <direction> and record the move if it was
+        performed.
+
+        Return True iff the rotate was performed.
+        """
+        if not block.rotate(direction):
+            return False
+        self._entries.append(('rotate', block, direction))
+        return True
+
+    def paint(self, block: Block, colour: Tuple[int, int, int]) -> bool:
+        """Paint <block> with <colour> and record the move if it was
+        performed.
+
+        Return True iff the colour of <block> was changed.
+        """
+        old_colour = block.colour_index
+        if not block.paint(colour):
+            return False
+        self._entries.append(('paint', block, old_colour))
+        return True
+
+    def combine(self, block: Block) -> bool:
+        """Combine <block> and record the move if it was performed.
+
+        Return True iff <block> was turned into a leaf.
+        """
+        children = block.children
+        # The children are kept for undo, so they must not be given back to
+        # the arena until this journal forgets the move.
+        if not block._merge():
+            return False
+        self._entries.append(('combine', block, children))
+        return True
+
+    def mark(self) -> int:
+        """Return a mark for the current point in this journal, which can be
+        passed to rollback later.
+        """
+        return len(self._entries)
+
+    def undo(self) -> None:
+        """Reverse the most recent move recorded in this journal, and forget
+        it.
+
+        Precondition: len(self) > 0
+        """
+        action, block, data = self._entries.pop()
+        if action == 'smash':
+            children = block.children
+            block.children = []
+            block._colour = data
+            if block._arena is not None:
+                for child in children:
+                    block._arena.release(child)
+        elif action == 'swap':
+            # A swap is its own inverse.
+            block.swap(data)
+        elif action == 'rotate':
+            block.rotate(4 - data)
+        elif action == 'paint':
+            block._colour = data
+        else:
+            block._colour = None
+            block.children = data
+        block._invalidate()
+        if action in ('smash', 'paint', 'combine'):
+            block._changed('undo')
+
+    def rollback(self, mark: int = 0) -> None:
+        """Reverse every move recorded in this journal since <mark>, most
+        recent first.
+
+        Precondition: 0 <= mark <= len(self)
+        """
+        while len(self._entries) > mark:
+            self.undo()
+
+    def clear(self) -> None:
+        """Forget every move recorded in this journal, keeping the moves.
+
+        The children that combined Blocks had before they were combined are
+        given back to their arena, if they came from one.
+        """
+        for action, block, data in self._entries:
+            if action == 'combine' and block._arena is not None:
+                for child in data:
+                    block._arena.release(child)
+        self._entries = []
+
+
+class NodeArena:
+    """A supply of Blocks that are recycled instead of being freed.
+
+    A board whose Blocks come from an arena (see generate_board and copy)
+    takes the children it needs from the arena when a Block is smashed, and
+    gives them back when a Block is combined, so a long game or search keeps
+    reusing the same Block objects instead of creating new ones and leaving
+    the old ones to the garbage collector. An arena can be kept for one
+    board, or for all the boards used by one search.
+
+    A Block that has been given back to the arena is reused for another part
+    of some board, so nothing else may still refer to it.
+
+    Nothing in the game itself uses an arena: it is for code that makes and
+    throws away many copies of boards, such as a search. Blocks that are
+    linked to their parents and children are only freed by the garbage
+    collector's cycle detection, so every copy thrown away brings the next
+    collection closer. A copy given back to an arena is not garbage at all.
+
+    >>> arena = NodeArena()
+    >>> board = arena.acquire((0, 0), 750, COLOUR_LIST[0], 0, 1)
+    >>> board.smash()
+    True
+    >>> arena.live, arena.recycled, arena.high_water
+    (5, 0, 5)
+    >>> copy = arena.copy(board)
+    >>> arena.live, arena.recycled, arena.high_water
+    (10, 0, 10)
+    >>> arena.release(copy)
+    >>> arena.release(arena.copy(board))
+    >>> arena.live, arena.recycled, arena.high_water
+    (5, 5, 10)
+
+    The children of a Block combined through a MoveJournal are given back
+    once the journal forgets the move, even if it is never cleared:
+
+    >>> for child in board.children:
+    ...     child.colour = COLOUR_LIST[1]
+    >>> journal = MoveJournal()
+    >>> journal.combine(board)
+    True
+    >>> arena.live
+    5
+    >>> del journal
+    >>> arena.live, arena.recycled, arena.high_water
+    (1, 5, 10)
+
+    === Public Attributes ===
+    live:
+        The number of Blocks taken from this arena and not given back.
+    recycled:
+        The number of Blocks that were taken from this arena's free list
+        instead of being created.
+    high_water:
+        The largest value that <live> has had.
+    """
+    # === Private Attributes ===
+    # _free:
+    #   The Blocks that are ready to be taken from this arena.
+    live: int
+    recycled: int
+    high_water: int
+    _free: List[Block]
+
+    def __init__(self, capacity: int = 0) -> None:
+        """Initialize this arena with <capacity> Blocks ready to be taken.
+        """
+        self.live = 0
+        self.recycled = 0
+        self.high_water = 0
+        self._free = [Block((0, 0), 1, None, 0, 0) for _ in range(capacity)]
+
+    def acquire(self, position: Tuple[int, int], size: int,
+                colour: Optional[Tuple[int, int, int]], level: int,
+                max_depth: int) -> Block:
+        """Return a Block from this arena with no children and the given
+        <position>, <size>, <colour>, <level> and <max_depth>.
+
+        The Block's own children will also come from this arena.
+        """
+        if len(self._free) == 0:
+            block = Block(position, size, colour, level, max_depth)
+        else:
+            block = self._free.pop()
+            block._origin = position
+            block.size = size
+            block._colour = None if colour is None else colour_index(colour)
+            block.level = level
+            block.max_depth = max_depth
+            self.recycled += 1
+        block._arena = self
+        self.live += 1
+        if self.live > self.high_water:
+            self.high_water = self.live
+        return block
+
+    def release(self, block: Block) -> None:
+        """Give <block> and all its descendants back to this arena.
+
+        Precondition: <block> and its descendants were taken from this arena,
+        and <block> is not the child of any Block.
+        """
+        stack = [block]
+        while len(stack) != 0:
+            node = stack.pop()
+            stack.extend(node._children)
+            node._parent = None
+            node._children = _NO_CHILDREN
+            node._turn = 0
+            node._hash = None
+            node._colour = None
+            node._arena = None
+            node._version = 0
+            node._observers = None
+            self._free.append(node)
+            self.live -= 1
+
+    def copy(self, board: Block) -> Block:
+        """Return a deep copy of <board> made of Blocks from this arena.
+
+        The copy can be given back in one go with release when it is no
+        longer needed.
+        """
+        board._settle()
+        new = self.acquire(board.position, board.size, board.colour,
+                           board.level, board.max_depth)
+        self._copy_children(board, new)
+        return new
+
+    def _copy_children(self, block: Block, new: Block) -> None:
+        """Give <new> copies of the descendants of <block>, made of Blocks from
+        this arena.
+
+        Precondition: <new> is a leaf taken from this arena, and no ancestor
+        of <block> has a turn pending.
+        """
+        children = block._turned_children()
+        if len(children) == 0:
+            return
+        new._colour = None
+        new._children = []
+        free = self._free
+        for child in children:
+            if len(free) == 0:
+                copy = Block((0, 0), child.size, None, child.level,
+                             child.max_depth)
+            else:
+                copy = free.pop()
+                copy.size = child.size
+                copy.level = child.level
+                copy.max_depth = child.max_depth
+                self.recycled += 1
+            copy._colour = child._colour
+            copy._parent = new
+            copy._arena = self
+            new._children.append(copy)
+            self._copy_children(child, copy)
+        self.live += 4
+        if self.live > self.high_water:
+            self.high_water = self.live
+
+
+class BoardPool:
+    """A supply of random boards that are generated ahead of time.
+
+    Generating boards in bulk with generate_boards is much faster than
+    generating them one at a time, so a pool can be filled before it is
+    needed (for example, before a Game starts) and boards taken from it
+    without any delay.
+
+    === Public Attributes ===
+    max_depth:
+        The depth of the boards in this pool.
+    size:
+        The height and width of the boards in this pool.
+    """
+    # === Private Attributes ===
+    # _boards:
+    #   The boards that are ready to be taken.
+    # _seeds:
+    #   The generator that the seed for each batch of boards is drawn from.
+    max_depth: int
+    size: int
+    _boards: List[Block]
+    _seeds: random.Random
+
+    def __init__(self, max_depth: int, size: int,
+                 seed: Optional[int] = None) -> None:
+        """Initialize an empty pool of boards with a depth of <max_depth> and
+        dimensions of <size> by <size>.
+
+        If <seed> is not None, the pool produces the same boards every time
+        it is filled the same way.
+        """
+        self.max_depth = max_depth
+        self.size = size
+        self._boards = []
+        self._seeds = random.Random(seed)
+
+    def __len__(self) -> int:
+        """Return the number of boards that are ready to be taken.
+        """
+        return len(self._boards)
+
+    def prewarm(self, n: int) -> None:
+        """Generate <n> more boards for this pool.
+        """
+        boards = generate_boards(n, self.max_depth, self.size,
+                                 self._seeds.getrandbits(64))
+        # Boards are taken from the end, so reverse them to hand them out in
+        # the order they were generated.
+        boards.reverse()
+        self._boards[:0] = boards
+
+    def take(self) -> Block:
+        """Remove and return a board from this pool.
+
+        If the pool is empty, a new board is generated first.
+        """
+        if len(self._boards) == 0:
+            self.prewarm(1)
+        return self._boards.pop()
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'allowed-import-modules': [
+            'doctest', 'python_ta', 'random', 'typing', '__future__', 'math',
+            'functools', 'settings'
+        ],
+        'max-attributes': 15,
+        'max-args': 6
+    })
+
+    # This is a board consisting of only one block.
+    b1 = Block((0, 0), 750, COLOUR_LIST[0], 0, 1)
+    print("=== tiny board ===")
+    print(b1)
+
+    # Now let's make a random board.
+    b2 = generate_board(3, 750)
+    print("\n=== random board ===")
+    print(b2)
@@ -1,251 +1,451 @@
-"""CSC148 Assignment 2
-
-=== CSC148 Winter 2020 ===
-Department of Computer Science,
-University of Toronto
-
-This code is provided solely for the personal and private use of
-students taking the CSC148 course at the University of Toronto.
-Copying for purposes other than this use is expressly prohibited.
-All forms of distribution of this code, whether as given or with
-any changes, are expressly prohibited.
-
-Authors: Diane Horton, David Liu, Mario Badr, Sophia Huynh, Misha Schwartz,
-and Jaisie Sin
-
-All of the files in this directory and all subdirectories are:
-Copyright (c) Diane Horton, David Liu, Mario Badr, Sophia Huynh,
-Misha Schwartz, and Jaisie Sin
-
-=== Module Description ===
-
-This file contains the hierarchy of Goal classes.
-"""
-from __future__ import annotations
-import math
-import random
-from typing import List, Tuple
-from block import Block
-from settings import colour_name, COLOUR_LIST
-
-
-def generate_goals(num_goals: int) -> List[Goal]:
-    """Return a randomly generated list of goals with length num_goals.
-
-    All elements of the list must be the same type of goal, but each goal
-    must have a different randomly generated colour from COLOUR_LIST. No two
-    goals can have the same colour.
-
-    Precondition:
-        - num_goals <= len(COLOUR_LIST)
-    """
-    ans = []
-    options = [PerimeterGoal, BlobGoal]
-    goal_type = random.choice(options)
-    colours_ = random.sample(COLOUR_LIST, num_goals)
-    if goal_type == PerimeterGoal:
-        for colour in colours_:
-            ans.append(PerimeterGoal(colour))
-    else:
-        for colour in colours_:
-            ans.append(BlobGoal(colour))
-    return ans
-
-
-def _flatten(block: Block) -> List[List[Tuple[int, int, int]]]:
-    """Return a two-dimensional list representing <block> as rows and columns of
-    unit cells.
-
-    Return a list of lists L, where,
-    for 0 <= i, j < 2^{max_depth - self.level}
-        - L[i] represents column i and
-        - L[i][j] represents the unit cell at column i and row j.
-
-    Each unit cell is represented by a tuple of 3 ints, which is the colour
-    of the block at the cell location[i][j]
-
-    L[0][0] represents the unit cell in the upper left corner of the Block.
-    """
-    if block.max_depth - block.level == 0:
-        return [[block.colour]]
-
-    ans = []
-    if len(block.children) == 0:
-        for i in range(int(
-                math.pow(2, (block.max_depth - block.level)))):
-            ans.append([])
-            for _ in range(int(
-                    math.pow(2, (block.max_depth - block.level)))):
-                ans[i].append(block.colour)
-    else:
-        flatten_child_ur = _flatten(block.children[0])
-        flatten_child_ul = _flatten(block.children[1])
-        flatten_child_ll = _flatten(block.children[2])
-        flatten_child_lr = _flatten(block.children[3])
-        for i in range(len(flatten_child_ul)):
-            ans.append(flatten_child_ul[i]+flatten_child_ll[i])
-        for i in range(len(flatten_child_ur)):
-            ans.append(flatten_child_ur[i] + flatten_child_lr[i])
-    return ans
-
-
-class Goal:
-    """A player goal in the game of Blocky.
-
-    This is an abstract class. Only child classes should be instantiated.
-
-    === Attributes ===
-    colour:
-        The target colour for this goal, that is the colour to which
-        this goal applies.
-    """
-    colour: Tuple[int, int, int]
-
-    def __init__(self, target_colour: Tuple[int, int, int]) -> None:
-        """Initialize this goal to have the given target colour.
-        """
-        self.colour = target_colour
-
-    def score(self, board: Block) -> int:
-        """Return the current score for this goal on the given board.
-
-        The score is always greater than or equal to 0.
-        """
-        raise NotImplementedError
-
-    def description(self) -> str:
-        """Return a description of this goal.
-        """
-        raise NotImplementedError
-
-
-class PerimeterGoal(Goal):
-    """A player goal in the game of Blocky.
-
-    This is an abstract class. Only child classes should be instantiated.
-
-    === Attributes ===
-    colour:
-        The target colour for this goal, that is the colour to which
-        this goal applies.
-    """
-    colour: Tuple[int, int, int]
-
-    def score(self, board: Block) -> int:
-        # accumulator
-        score = 0
-        # first flatten the block
-        flatten_block = _flatten(board)
-        # see how many units on the perimeters are of colour c
-        # corners count twice
-        target_colour = self.colour
-        for c in flatten_block[0]:
-            if c == target_colour:
-                score += 1
-        for c in flatten_block[-1]:
-            if c == target_colour:
-                score += 1
-        for lst in flatten_block:
-            if lst[0] == target_colour:
-                score += 1
-            if lst[-1] == target_colour:
-                score += 1
-        return score
-
-    def description(self) -> str:
-        c = colour_name(self.colour)
-        s = "Put the most possible units of a given" \
-            " colour, {}.".format(c) +\
-            "on the outer perimeter of the board."
-        return s
-
-
-class BlobGoal(Goal):
-    """A player goal in the game of Blocky.
-
-    This is an abstract class. Only child classes should be instantiated.
-
-    === Attributes ===
-    colour:
-        The target colour for this goal, that is the colour to which
-        this goal applies.
-    """
-    colour: Tuple[int, int, int]
-
-    def score(self, board: Block) -> int:
-        # create a flatten board
-        f_board = _flatten(board)
-        # create a visited
-        size_of_board = len(f_board)
-        visited = []
-        for i in range(size_of_board):
-            visited.append([])
-            for j in range(size_of_board):
-                visited[i].append(-1)
-        # find the max
-        max_blob = 0
-        for i in range(size_of_board):
-            for j in range(size_of_board):
-                temp_count = self._undiscovered_blob_size(
-                    (i, j), f_board, visited)
-                if temp_count >= max_blob:
-                    max_blob = temp_count
-        return max_blob
-
-    def _undiscovered_blob_size(self, pos: Tuple[int, int],
-                                board: List[List[Tuple[int, int, int]]],
-                                visited: List[List[int]]) -> int:
-        """Return the size of the largest connected blob that (a) is of this
-        Goal's target colour, (b) includes the cell at <pos>, and (c) involves
-        only cells that have never been visited.
-
-        If <pos> is out of bounds for <board>, return 0.
-
-        <board> is the flattened board on which to search for the blob.
-        <visited> is a parallel structure that, in each cell, contains:
-            -1 if this cell has never been visited
-            0  if this cell has been visited and discovered
-               not to be of the target colour
-            1  if this cell has been visited and discovered
-               to be of the target colour
-
-        Update <visited> so that all cells that are visited are marked with
-        either 0 or 1.
-        """
-        # If <pos> is out of bounds for <board>, return 0.
-        if pos[0] >= len(board) or pos[1] >= len(board) \
-                or pos[0] < 0 or pos[1] < 0:
-            return 0
-        if board[pos[0]][pos[1]] != self.colour:
-            visited[pos[0]][pos[1]] = 0
-            return 0
-        if visited[pos[0]][pos[1]] != -1:
-            return 0
-        else:
-            ans = 1
-            visited[pos[0]][pos[1]] = 1
-            ans = ans + self._undiscovered_blob_size(
-                (pos[0] + 1, pos[1]), board, visited)
-            ans = ans + self._undiscovered_blob_size(
-                (pos[0] - 1, pos[1]), board, visited)
-            ans = ans + self._undiscovered_blob_size(
-                (pos[0], pos[1] + 1), board, visited)
-            ans = ans + self._undiscovered_blob_size(
-                (pos[0], pos[1] - 1), board, visited)
-        return ans
-
-    def description(self) -> str:
-        c = colour_name(self.colour)
-        s = 'Aim for the largest blob of a given colour, {}.'.format(c)
-        return s
-
-
-if __name__ == '__main__':
-    import python_ta
-    python_ta.check_all(config={
-        'allowed-import-modules': [
-            'doctest', 'python_ta', 'random', 'typing', 'block', 'settings',
-            'math', '__future__'
-        ],
-        'max-attributes': 15
-    })
+"""CSC148 Assignment 2
+
+=== CSC148 Winter 2020 ===
+Department of Computer Science,
+University of Toronto
+
+This code is provided solely for the personal and private use of
+students taking the CSC148 course at the University of Toronto.
+Copying for purposes other than this use is expressly prohibited.
+All forms of distribution of this code, whether as given or with
+any changes, are expressly prohibited.
+
+Authors: Diane Horton, David Liu, Mario Badr, Sophia Huynh, Misha Schwartz,
+and Jaisie Sin
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) Diane Horton, David Liu, Mario Badr, Sophia Huynh,
+Misha Schwartz, and Jaisie Sin
+
+=== Module Description ===
+
+This file contains the hierarchy of Goal classes.
+"""
+from __future__ import annotations
+import random
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from block import Block
+from raster import Grid, edge_counts, is_stack, largest_blobs
+from settings import colour_name, colour_index, COLOUR_LIST, PALETTE
+
+
+def generate_goals(num_goals: int) -> List[Goal]:
+    """Return a randomly generated list of goals with length num_goals.
+
+    All elements of the list must be the same type of goal, but each goal
+    must have a different randomly generated colour from COLOUR_LIST. No two
+    goals can have the same colour.
+
+    Precondition:
+        - num_goals <= len(COLOUR_LIST)
+    """
+    ans = []
+    options = [PerimeterGoal, BlobGoal]
+    goal_type = random.choice(options)
+    colours_ = random.sample(COLOUR_LIST, num_goals)
+    if goal_type == PerimeterGoal:
+        for colour in colours_:
+            ans.append(PerimeterGoal(colour))
+    else:
+        for colour in colours_:
+            ans.append(BlobGoal(colour))
+    return ans
+
+
+# For each side of a block (top, left, bottom and right), the indices of the
+# two children that lie along that side.
+_SIDES = ((0, 1), (1, 2), (2, 3), (0, 3))
+
+
+def _side_score(board: Block, side: Tuple[int, int], colour: int) -> int:
+    """Return the number of unit cells along <side> of <board> whose colour
+    has palette index <colour>.
+
+    Only the blocks that touch <side> are visited, so this takes time
+    proportional to the number of those blocks, not the number of cells.
+    """
+    score = 0
+    stack = [board]
+    while len(stack) != 0:
+        block = stack.pop()
+        children = block.children
+        if len(children) == 0:
+            if block.colour_index == colour:
+                # A leaf covers this many unit cells along each of its sides.
+                score += 2 ** (block.max_depth - block.level)
+        else:
+            stack.append(children[side[0]])
+            stack.append(children[side[1]])
+    return score
+
+
+class _UnionFind:
+    """A union-find structure over components that each have a size and a
+    colour.
+
+    Only components of the same colour are ever joined.
+
+    === Public Attributes ===
+    sizes:
+        For each component that is the root of its set, the total size of
+        every component in that set.
+    colours:
+        The palette index of the colour of each component.
+    """
+    # === Private Attributes ===
+    # _parents:
+    #   The parent of each component. A component is the root of its set iff
+    #   it is its own parent.
+    sizes: List[int]
+    colours: List[int]
+    _parents: List[int]
+
+    def __init__(self) -> None:
+        """Initialize a union-find structure with no components.
+        """
+        self.sizes = []
+        self.colours = []
+        self._parents = []
+
+    def add(self, size: int, colour: int) -> int:
+        """Add a component of <size> and <colour> in a set of its own, and
+        return it.
+        """
+        self._parents.append(len(self._parents))
+        self.sizes.append(size)
+        self.colours.append(colour)
+        return len(self._parents) - 1
+
+    def find(self, component: int) -> int:
+        """Return the root of the set that <component> is in.
+        """
+        parents = self._parents
+        while parents[component] != component:
+            parents[component] = parents[parents[component]]
+            component = parents[component]
+        return component
+
+    def union(self, a: int, b: int) -> None:
+        """Join the sets that components <a> and <b> are in.
+        """
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a != root_b:
+            self._parents[root_b] = root_a
+            self.sizes[root_a] += self.sizes[root_b]
+
+    def largest(self) -> Dict[int, int]:
+        """Return the total size of the largest set of each colour that there
+        are components of.
+        """
+        ans = {}
+        for component, parent in enumerate(self._parents):
+            if parent == component:
+                colour = self.colours[component]
+                ans[colour] = max(ans.get(colour, 0), self.sizes[component])
+        return ans
+
+
+# The spans of leaves along each side of a block (top, left,
+# bottom and right, in that order). Each span is the first unit cell it
+# covers, the unit cell just past its end, and its leaf's component, with
+# unit cells counted from the top or left end of the side.
+_Spans = Tuple[List[Tuple[int, int, int]], List[Tuple[int, int, int]],
+               List[Tuple[int, int, int]], List[Tuple[int, int, int]]]
+
+
+def _join(first: List[Tuple[int, int, int]],
+          second: List[Tuple[int, int, int]], components: _UnionFind) -> None:
+    """Join the components of the spans in <first> and <second> that touch
+    and have the same colour.
+
+    <first> and <second> are the spans along the two sides of a shared edge,
+    each in order, so they are walked together like a merge.
+    """
+    colours = components.colours
+    i = 0
+    j = 0
+    while i < len(first) and j < len(second):
+        start_a, end_a, component_a = first[i]
+        start_b, end_b, component_b = second[j]
+        if start_a < end_b and start_b < end_a and \
+                colours[component_a] == colours[component_b]:
+            components.union(component_a, component_b)
+        if end_a < end_b:
+            i += 1
+        else:
+            j += 1
+
+
+def _shift(spans: List[Tuple[int, int, int]],
+           offset: int) -> List[Tuple[int, int, int]]:
+    """Return <spans> moved <offset> unit cells further along their side.
+    """
+    return [(start + offset, end + offset, component)
+            for start, end, component in spans]
+
+
+def _leaf_spans(block: Block, colour: Optional[int],
+                components: _UnionFind) -> _Spans:
+    """Add a component to <components> for each leaf of <block> whose colour
+    has palette index <colour>, join the components of such leaves that
+    share an edge and have the same colour, and return the spans of those
+    leaves along each side of <block>.
+
+    If <colour> is None, every leaf of <block> gets a component.
+    """
+    children = block.children
+    if len(children) == 0:
+        if colour is not None and block.colour_index != colour:
+            return [], [], [], []
+        width = 2 ** (block.max_depth - block.level)
+        span = [(0, width, components.add(width * width,
+                                          block.colour_index))]
+        return span, span, span, span
+
+    half = 2 ** (block.max_depth - block.level - 1)
+    ur, ul, ll, lr = [_leaf_spans(child, colour, components)
+                      for child in children]
+    # Join the children across the two edges that split <block>.
+    _join(ul[3], ur[1], components)
+    _join(ll[3], lr[1], components)
+    _join(ul[2], ll[0], components)
+    _join(ur[2], lr[0], components)
+    return (ul[0] + _shift(ur[0], half), ul[1] + _shift(ll[1], half),
+            ll[2] + _shift(lr[2], half), ur[3] + _shift(lr[3], half))
+
+
+def _largest_blob(board: Block, colour: int) -> int:
+    """Return the size of the largest connected blob of unit cells of <board>
+    whose colour has palette index <colour>.
+
+    Instead of visiting unit cells, each leaf of <colour> is one component
+    covering all of its cells, and leaves that share an edge are joined. Only
+    the leaves along the edges between the children of each block are
+    compared, so this takes time proportional to the number of leaves (times
+    the depth of the board) rather than the number of unit cells.
+    """
+    components = _UnionFind()
+    _leaf_spans(board, colour, components)
+    return components.largest().get(colour, 0)
+
+
+def _largest_blobs(board: Block) -> Dict[int, int]:
+    """Return the size of the largest connected blob of unit cells of <board>
+    of each colour on <board>, by palette index.
+
+    The blobs of every colour are found together, in the same way as
+    _largest_blob finds the blobs of one colour. They are the same blobs as
+    flood filling the unit cells of the board finds, even where a rotation
+    has not been pushed down to the leaves yet:
+
+    >>> from block import generate_boards
+    >>> from raster import _largest_by_flood, rasterize
+    >>> boards = generate_boards(40, 6, 750, seed=17)
+    >>> for board in boards:
+    ...     _ = board.children[0].rotate(1)
+    >>> all(_largest_blobs(board) == _largest_by_flood(rasterize(board))
+    ...     for board in boards)
+    True
+    >>> all(_largest_blob(board, colour) == _largest_blobs(board).get(colour, 0)
+    ...     for board in boards for colour in range(len(COLOUR_LIST)))
+    True
+    """
+    components = _UnionFind()
+    _leaf_spans(board, None, components)
+    return components.largest()
+
+
+def _perimeter_scores(board: Block) -> Dict[int, int]:
+    """Return the number of unit cells along the sides of <board> of each
+    colour on them, by palette index, counting the corners twice.
+
+    Every colour is counted in one walk along each side, in the same way as
+    _side_score counts one colour.
+    """
+    scores = {}
+    for side in _SIDES:
+        stack = [board]
+        while len(stack) != 0:
+            block = stack.pop()
+            children = block.children
+            if len(children) == 0:
+                colour = block.colour_index
+                scores[colour] = scores.get(colour, 0) + \
+                    2 ** (block.max_depth - block.level)
+            else:
+                stack.append(children[side[0]])
+                stack.append(children[side[1]])
+    return scores
+
+
+def score_goals(goals: List[Goal], board: Block) -> List[int]:
+    """Return the score of each goal in <goals> on <board>, in order.
+
+    The board is walked once for all of the perimeter goals and once for all
+    of the blob goals, however many goals there are, so scoring every
+    player's goal costs about the same as scoring one.
+    """
+    perimeters = None
+    blobs = None
+    ans = []
+    for goal in goals:
+        if isinstance(goal, PerimeterGoal):
+            if perimeters is None:
+                perimeters = _perimeter_scores(board)
+            ans.append(perimeters.get(goal._colour, 0))
+        elif isinstance(goal, BlobGoal):
+            if blobs is None:
+                blobs = _largest_blobs(board)
+            ans.append(blobs.get(goal._colour, 0))
+        else:
+            ans.append(goal.score(board))
+    return ans
+
+
+class Goal:
+    """A player goal in the game of Blocky.
+
+    This is an abstract class. Only child classes should be instantiated.
+
+    === Attributes ===
+    colour:
+        The target colour for this goal, that is the colour to which
+        this goal applies.
+    """
+    # === Private Attributes ===
+    # _colour:
+    #   The index of the target colour in settings.PALETTE, which is what the
+    #   goals compare unit cells against.
+    colour: Tuple[int, int, int]
+    _colour: int
+
+    def __init__(self, target_colour: Tuple[int, int, int]) -> None:
+        """Initialize this goal to have the given target colour.
+        """
+        self.colour = target_colour
+
+    @property
+    def colour(self) -> Tuple[int, int, int]:
+        """The target colour for this goal.
+        """
+        return PALETTE[self._colour]
+
+    @colour.setter
+    def colour(self, target_colour: Tuple[int, int, int]) -> None:
+        """Set the target colour for this goal to <target_colour>.
+        """
+        self._colour = colour_index(target_colour)
+
+    def score(self, board: Block) -> int:
+        """Return the current score for this goal on the given board.
+
+        The score is always greater than or equal to 0.
+        """
+        raise NotImplementedError
+
+    def score_many(self, boards: Union[Sequence[Block], Grid]) -> List[int]:
+        """Return the score for this goal on each of <boards>, in order.
+
+        <boards> is either a sequence of boards of any kind that score
+        accepts, or a stack of the grids of unit cells of boards of the same
+        size, as returned by raster.stack. Boards are scored one at a time,
+        by walking them. The grids in a stack are all scored at once. A grid
+        has four times as many unit cells for each level of depth, so deep
+        boards can be quicker to score one at a time.
+
+        >>> PerimeterGoal((1, 128, 181)).score_many([])
+        []
+        >>> BlobGoal((1, 128, 181)).score_many([])
+        []
+        >>> from block import generate_boards
+        >>> from linear import from_block
+        >>> from persistent import persistent_board
+        >>> boards = generate_boards(3, 3, 750, seed=21)
+        >>> goal = BlobGoal((1, 128, 181))
+        >>> scores = goal.score_many(boards)
+        >>> goal.score_many([from_block(board) for board in boards]) == scores
+        True
+        >>> goal.score_many([persistent_board(board).root
+        ...                  for board in boards]) == scores
+        True
+        """
+        if len(boards) == 0:
+            return []
+        if is_stack(boards):
+            return self._score_grids(boards)
+        return [self.score(board) for board in boards]
+
+    def _score_grids(self, grids: Grid) -> List[int]:
+        """Return the score for this goal on each grid in the stack <grids>,
+        in order.
+        """
+        raise NotImplementedError
+
+    def description(self) -> str:
+        """Return a description of this goal.
+        """
+        raise NotImplementedError
+
+
+class PerimeterGoal(Goal):
+    """A player goal in the game of Blocky.
+
+    This is an abstract class. Only child classes should be instantiated.
+
+    === Attributes ===
+    colour:
+        The target colour for this goal, that is the colour to which
+        this goal applies.
+    """
+    colour: Tuple[int, int, int]
+
+    def score(self, board: Block) -> int:
+        # Each side is scored separately, so the unit cells in the corners
+        # count twice.
+        return sum(_side_score(board, side, self._colour) for side in _SIDES)
+
+    def _score_grids(self, grids: Grid) -> List[int]:
+        return edge_counts(grids, self._colour)
+
+    def description(self) -> str:
+        c = colour_name(self.colour)
+        s = "Put the most possible units of a given" \
+            " colour, {}.".format(c) +\
+            "on the outer perimeter of the board."
+        return s
+
+
+class BlobGoal(Goal):
+    """A player goal in the game of Blocky.
+
+    This is an abstract class. Only child classes should be instantiated.
+
+    === Attributes ===
+    colour:
+        The target colour for this goal, that is the colour to which
+        this goal applies.
+    """
+    colour: Tuple[int, int, int]
+
+    def score(self, board: Block) -> int:
+        return _largest_blob(board, self._colour)
+
+    def _score_grids(self, grids: Grid) -> List[int]:
+        return largest_blobs(grids, self._colour)
+
+    def description(self) -> str:
+        c = colour_name(self.colour)
+        s = 'Aim for the largest blob of a given colour, {}.'.format(c)
+        return s
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config={
+        'allowed-import-modules': [
+            'doctest', 'python_ta', 'random', 'typing', 'block', 'settings',
+            'raster', '__future__'
+        ],
+        'max-attributes': 15
+    })
@@ -0,0 +1,555 @@
+"""CSC148 Assignment 2
+
+=== CSC148 Winter 2020 ===
+Department of Computer Science,
+University of Toronto
+
+This code is provided solely for the personal and private use of
+students taking the CSC148 course at the University of Toronto.
+Copying for purposes other than this use is expressly prohibited.
+All forms of distribution of this code, whether as given or with
+any changes, are expressly prohibited.
+
+Authors: Diane Horton, David Liu, Mario Badr, Sophia Huynh, Misha Schwartz,
+and Jaisie Sin
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) Diane Horton, David Liu, Mario Badr, Sophia Huynh,
+Misha Schwartz, and Jaisie Sin
+
+=== Module Description ===
+
+This file contains the LinearBoard class, an array-backed linear quadtree
+that stores a whole Blocky board in two flat arrays, and the LinearBlock
+class, a view of one node of a LinearBoard that can be used anywhere a Block
+is expected.
+"""
+from __future__ import annotations
+from array import array
+from typing import List, Optional, Tuple, Union
+import math
+import random
+
+from block import Block, SWAP_ORDER, child_positions, child_size, \
+    majority_colour
+from settings import colour_index, COLOUR_LIST, PALETTE
+
+# The code stored for a node that has children. No palette index can be this
+# large.
+INTERNAL = 255
+
+# The order in which a node's children end up after a rotation, given as the
+# old index of the child that lands at index 0, 1, 2 and 3. The order after
+# a swap is block.SWAP_ORDER.
+_ROTATE_ORDER = {1: (1, 2, 3, 0), 3: (3, 0, 1, 2)}
+
+
+def generate_linear_board(max_depth: int, size: int) -> LinearBlock:
+    """Return the root of a new game board with a depth of <max_depth> and
+    dimensions of <size> by <size>, stored in a LinearBoard.
+
+    The board is generated exactly as block.generate_board would generate it
+    from the same random state.
+
+    >>> board = generate_linear_board(3, 750)
+    >>> board.max_depth
+    3
+    >>> len(board.children) == 4
+    True
+    """
+    board = LinearBoard((0, 0), size, random.choice(COLOUR_LIST), max_depth)
+    root = board.root()
+    root.smash()
+
+    return root
+
+
+def from_block(block: Block) -> LinearBlock:
+    """Return the root of a new LinearBoard holding a copy of <block> and all
+    its descendants.
+
+    Precondition: block.level == 0
+    """
+    board = LinearBoard(block.position, block.size, COLOUR_LIST[0],
+                        block.max_depth)
+    codes = array('B')
+    extents = array('I')
+    _append_block(block, codes, extents)
+    board.set_arrays(codes, extents)
+
+    return board.root()
+
+
+def _append_block(block: Block, codes: array, extents: array) -> None:
+    """Append <block> and its descendants to <codes> and <extents> in
+    pre-order.
+    """
+    index = len(codes)
+    if len(block.children) == 0:
+        codes.append(block.colour_index)
+        extents.append(1)
+    else:
+        codes.append(INTERNAL)
+        extents.append(0)
+        for child in block.children:
+            _append_block(child, codes, extents)
+        extents[index] = len(codes) - index
+
+
+class LinearBoard:
+    """A Blocky board stored as a linear quadtree.
+
+    Every node of the board is stored in pre-order in two parallel arrays, so
+    the subtree rooted at any node occupies a contiguous range of both arrays
+    that starts at the node itself. Nodes are identified by their path: the
+    sequence of child indices that leads from the root to the node.
+
+    === Public Attributes ===
+    position:
+        The (x, y) coordinates of the upper left corner of the board.
+    size:
+        The height and width of the board.
+    max_depth:
+        The deepest level allowed in the board.
+
+    === Representation Invariants ===
+    - len(_codes) == len(_extents) == _extents[0]
+    - _codes[i] == INTERNAL iff the node at index i has children
+    - _extents[i] is the number of nodes in the subtree rooted at index i
+    """
+    # === Private Attributes ===
+    # _codes:
+    #   For each node, the index of its colour in settings.PALETTE, or INTERNAL
+    #   if the node has children.
+    # _extents:
+    #   For each node, the number of nodes in the subtree rooted at it.
+    # _sizes:
+    #   The size of the blocks at each level, starting with the root.
+    position: Tuple[int, int]
+    size: int
+    max_depth: int
+    _codes: array
+    _extents: array
+    _sizes: List[int]
+
+    def __init__(self, position: Tuple[int, int], size: int,
+                 colour: Tuple[int, int, int], max_depth: int) -> None:
+        """Initialize this board as a single block with <position>,
+        dimensions <size> by <size>, the given <colour>, and <max_depth>.
+
+        Preconditions:
+            - size > 0
+            - max_depth >= 0
+        """
+        self.position = position
+        self.size = size
+        self.max_depth = max_depth
+        self._codes = array('B', [colour_index(colour)])
+        self._extents = array('I', [1])
+
+        self._sizes = [size]
+        for _ in range(max_depth):
+            self._sizes.append(child_size(self._sizes[-1]))
+
+    def root(self) -> LinearBlock:
+        """Return a view of the root of this board.
+        """
+        return LinearBlock(self, ())
+
+    def set_arrays(self, codes: array, extents: array) -> None:
+        """Replace the contents of this board with the pre-order <codes> and
+        <extents>.
+        """
+        self._codes = codes
+        self._extents = extents
+
+    def copy(self) -> LinearBoard:
+        """Return a new LinearBoard that is a copy of this board.
+        """
+        new = LinearBoard(self.position, self.size, COLOUR_LIST[0],
+                          self.max_depth)
+        new.set_arrays(array('B', self._codes), array('I', self._extents))
+        return new
+
+    def num_nodes(self) -> int:
+        """Return the number of nodes in this board.
+        """
+        return len(self._codes)
+
+    def _index_chain(self, path: Tuple[int, ...]) -> List[int]:
+        """Return the indices of the nodes along <path>, starting with the root
+        and ending with the node at <path>.
+        """
+        extents = self._extents
+        chain = [0]
+        i = 0
+        for k in path:
+            j = i + 1
+            for _ in range(k):
+                j += extents[j]
+            chain.append(j)
+            i = j
+        return chain
+
+    def _index(self, path: Tuple[int, ...]) -> int:
+        """Return the index of the node at <path>.
+        """
+        return self._index_chain(path)[-1]
+
+    def _child_indices(self, i: int) -> List[int]:
+        """Return the indices of the four children of the node at index <i>.
+
+        Precondition: the node at index <i> has children.
+        """
+        ans = [i + 1]
+        for _ in range(3):
+            ans.append(ans[-1] + self._extents[ans[-1]])
+        return ans
+
+    def _replace(self, path: Tuple[int, ...], codes: array,
+                 extents: array) -> None:
+        """Replace the subtree at <path> with the pre-order <codes> and
+        <extents>, and update the extents of its ancestors.
+        """
+        chain = self._index_chain(path)
+        i = chain[-1]
+        end = i + self._extents[i]
+        delta = len(codes) - (end - i)
+        self._codes[i:end] = codes
+        self._extents[i:end] = extents
+        for ancestor in chain[:-1]:
+            self._extents[ancestor] += delta
+
+    def _reordered(self, i: int, order: Tuple[int, int, int, int],
+                   recursive: bool) -> Tuple[array, array]:
+        """Return the codes and extents of the subtree at index <i> with its
+        children put in <order>. If <recursive> is True, the children of every
+        descendant are put in <order> too.
+        """
+        if self._codes[i] != INTERNAL:
+            return self._codes[i:i + 1], self._extents[i:i + 1]
+
+        kids = self._child_indices(i)
+        codes = array('B', [INTERNAL])
+        extents = array('I', [self._extents[i]])
+        for k in order:
+            start = kids[k]
+            if recursive:
+                child_codes, child_extents = self._reordered(start, order,
+                                                             True)
+            else:
+                end = start + self._extents[start]
+                child_codes = self._codes[start:end]
+                child_extents = self._extents[start:end]
+            codes.extend(child_codes)
+            extents.extend(child_extents)
+        return codes, extents
+
+    def _random_subtree(self, level: int, codes: array,
+                        extents: array) -> None:
+        """Append to <codes> and <extents> a randomly generated subtree whose
+        root is at <level> and has four children.
+
+        Random numbers are drawn in the same order as Block.smash draws them.
+        """
+        index = len(codes)
+        codes.append(INTERNAL)
+        extents.append(0)
+        colours = [colour_index(random.choice(COLOUR_LIST))
+                   for _ in range(4)]
+        for colour in colours:
+            if random.random() < math.exp(-0.25 * (level + 1)) and \
+                    level + 1 != self.max_depth:
+                self._random_subtree(level + 1, codes, extents)
+            else:
+                codes.append(colour)
+                extents.append(1)
+        extents[index] = len(codes) - index
+
+    def smash(self, path: Tuple[int, ...]) -> bool:
+        """Sub-divide the block at <path> so that it has four randomly
+        generated children.
+
+        Return True iff the smash was performed.
+        """
+        i = self._index(path)
+        if len(path) == self.max_depth or self._codes[i] == INTERNAL:
+            return False
+        codes = array('B')
+        extents = array('I')
+        self._random_subtree(len(path), codes, extents)
+        self._replace(path, codes, extents)
+        return True
+
+    def swap(self, path: Tuple[int, ...], direction: int) -> bool:
+        """Swap the children of the block at <path> horizontally if
+        <direction> is 0, or vertically if <direction> is 1.
+
+        Return True iff the swap was performed.
+        """
+        i = self._index(path)
+        if self._codes[i] != INTERNAL:
+            return False
+        codes, extents = self._reordered(i, SWAP_ORDER[direction], False)
+        self._replace(path, codes, extents)
+        return True
+
+    def rotate(self, path: Tuple[int, ...], direction: int) -> bool:
+        """Rotate the block at <path> and all its descendants, clockwise if
+        <direction> is 1 or counter-clockwise if <direction> is 3.
+
+        Return True iff the rotate was performed.
+        """
+        i = self._index(path)
+        if self._codes[i] != INTERNAL:
+            return False
+        codes, extents = self._reordered(i, _ROTATE_ORDER[direction], True)
+        self._replace(path, codes, extents)
+        return True
+
+    def paint(self, path: Tuple[int, ...],
+              colour: Tuple[int, int, int]) -> bool:
+        """Change the colour of the block at <path> iff it is a leaf at a level
+        of max_depth and its colour is different from <colour>.
+
+        Return True iff the colour was changed.
+        """
+        i = self._index(path)
+        code = colour_index(colour)
+        if len(path) != self.max_depth or self._codes[i] == code:
+            return False
+        self._codes[i] = code
+        return True
+
+    def combine(self, path: Tuple[int, ...]) -> bool:
+        """Turn the block at <path> into a leaf based on the majority colour of
+        its children, as Block.combine does.
+
+        Return True iff the block was turned into a leaf.
+        """
+        majority = self._majority(path)
+        if majority is None:
+            return False
+        self._replace(path, array('B', [majority]), array('I', [1]))
+        return True
+
+    def combinable(self, path: Tuple[int, ...]) -> bool:
+        """Return True iff the block at <path> can be combined, as
+        Block.combinable does.
+        """
+        return self._majority(path) is not None
+
+    def _majority(self, path: Tuple[int, ...]) -> Optional[int]:
+        """Return the palette index of the majority colour of the children of
+        the block at <path>, or None if it cannot be combined.
+        """
+        i = self._index(path)
+        if self._codes[i] != INTERNAL or len(path) != self.max_depth - 1:
+            return None
+        return majority_colour(
+            [self._codes[k] for k in self._child_indices(i)])
+
+    def geometry(self, path: Tuple[int, ...]) -> Tuple[Tuple[int, int], int]:
+        """Return the position and size of the block at <path>.
+        """
+        position = self.position
+        corner = (position[0] + self.size, position[1] + self.size)
+        for level, k in enumerate(path):
+            position = child_positions(position, self._sizes[level],
+                                       corner)[k]
+        return position, self._sizes[len(path)]
+
+    def code(self, path: Tuple[int, ...]) -> int:
+        """Return the code stored for the block at <path>.
+        """
+        return self._codes[self._index(path)]
+
+    def subtree(self, path: Tuple[int, ...]) -> Tuple[array, array]:
+        """Return the codes and extents of the subtree at <path>.
+        """
+        i = self._index(path)
+        end = i + self._extents[i]
+        return self._codes[i:end], self._extents[i:end]
+
+    def to_block(self, path: Tuple[int, ...] = ()) -> Block:
+        """Return a new Block that is a copy of the subtree at <path>.
+        """
+        position, size = self.geometry(path)
+        return self._build_block(self._index(path), position, size,
+                                 len(path))
+
+    def _build_block(self, i: int, position: Tuple[int, int], size: int,
+                     level: int) -> Block:
+        """Return a new Block for the subtree at index <i>, whose root has
+        <position>, <size> and <level>.
+        """
+        code = self._codes[i]
+        if code != INTERNAL:
+            return Block(position, size, PALETTE[code], level,
+                         self.max_depth)
+        block = Block(position, size, None, level, self.max_depth)
+        positions = block._children_positions()
+        size_of_child = block._child_size()
+        block.children = [
+            self._build_block(j, positions[k], size_of_child, level + 1)
+            for k, j in enumerate(self._child_indices(i))]
+        return block
+
+
+class LinearBlock:
+    """A view of one node of a LinearBoard, with the same interface as Block.
+
+    A LinearBlock refers to the node at a fixed path of its board, so after a
+    move it refers to whatever node is now at that path.
+
+    === Public Attributes ===
+    board:
+        The LinearBoard this view belongs to.
+    path:
+        The child indices that lead from the root of <board> to this node.
+    """
+    board: LinearBoard
+    path: Tuple[int, ...]
+
+    def __init__(self, board: LinearBoard, path: Tuple[int, ...]) -> None:
+        """Initialize this view of the node at <path> in <board>.
+        """
+        self.board = board
+        self.path = path
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        """The (x, y) coordinates of the upper left corner of this Block.
+        """
+        return self.board.geometry(self.path)[0]
+
+    @property
+    def size(self) -> int:
+        """The height and width of this square Block.
+        """
+        return self.board.geometry(self.path)[1]
+
+    @property
+    def level(self) -> int:
+        """The level of this Block within the board.
+        """
+        return len(self.path)
+
+    @property
+    def max_depth(self) -> int:
+        """The deepest level allowed in the board.
+        """
+        return self.board.max_depth
+
+    @property
+    def colour(self) -> Optional[Tuple[int, int, int]]:
+        """The colour of this Block, or None if it has children.
+        """
+        code = self.board.code(self.path)
+        if code == INTERNAL:
+            return None
+        return PALETTE[code]
+
+    @property
+    def colour_index(self) -> Optional[int]:
+        """The index of this Block's colour in settings.PALETTE, or None if it
+        has children.
+        """
+        code = self.board.code(self.path)
+        if code == INTERNAL:
+            return None
+        return code
+
+    @property
+    def children(self) -> List[LinearBlock]:
+        """Views of the children of this Block, in the same order as
+        Block.children.
+        """
+        if self.board.code(self.path) != INTERNAL:
+            return []
+        return [LinearBlock(self.board, self.path + (k,)) for k in range(4)]
+
+    def __str__(self) -> str:
+        """Return this Block in the same string format as Block.
+        """
+        return str(self.board.to_block(self.path))
+
+    def __eq__(self, other: object) -> bool:
+        """Return True iff this Block and all its descendants are equivalent
+        to the <other> Block and all its descendants.
+        """
+        if isinstance(other, LinearBlock):
+            return self.position == other.position and \
+                self.size == other.size and \
+                self.level == other.level and \
+                self.max_depth == other.max_depth and \
+                self.board.subtree(self.path) == other.board.subtree(
+                    other.path)
+        return self.board.to_block(self.path) == other
+
+    def smashable(self) -> bool:
+        """Return True iff this block can be smashed.
+        """
+        return self.level != self.max_depth and len(self.children) == 0
+
+    def combinable(self) -> bool:
+        """Return True iff this block can be combined.
+        """
+        return self.board.combinable(self.path)
+
+    def smash(self) -> bool:
+        """Sub-divide this block so that it has four randomly generated
+        children. Return True iff the smash was performed.
+        """
+        return self.board.smash(self.path)
+
+    def swap(self, direction: int) -> bool:
+        """Swap the child Blocks of this Block. Return True iff the swap was
+        performed.
+        """
+        return self.board.swap(self.path, direction)
+
+    def rotate(self, direction: int) -> bool:
+        """Rotate this Block and all its descendants. Return True iff the
+        rotate was performed.
+        """
+        return self.board.rotate(self.path, direction)
+
+    def paint(self, colour: Tuple[int, int, int]) -> bool:
+        """Change this Block's colour iff it is a leaf at a level of max_depth
+        and its colour is different from <colour>.
+        """
+        return self.board.paint(self.path, colour)
+
+    def combine(self) -> bool:
+        """Turn this Block into a leaf based on the majority colour of its
+        children. Return True iff this Block was turned into a leaf node.
+        """
+        return self.board.combine(self.path)
+
+    def create_copy(self) -> Union[LinearBlock, Block]:
+        """Return a deep copy of this Block.
+
+        The copy of a whole board is the root of a new LinearBoard. Any other
+        node is copied into a new Block, since its level is not zero.
+        """
+        if self.path == ():
+            return self.board.copy().root()
+        return self.board.to_block(self.path)
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'allowed-import-modules': [
+            'doctest', 'python_ta', 'random', 'typing', '__future__', 'math',
+            'array', 'block', 'settings'
+        ],
+        'max-attributes': 15,
+        'max-args': 6
+    })
+
+    b = generate_linear_board(3, 750)
+    print(f'=== random board ({b.board.num_nodes()} nodes) ===')
+    print(b)
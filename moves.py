@@ -0,0 +1,369 @@
+"""CSC148 Assignment 2
+
+=== CSC148 Winter 2020 ===
+Department of Computer Science,
+University of Toronto
+
+This code is provided solely for the personal and private use of
+students taking the CSC148 course at the University of Toronto.
+Copying for purposes other than this use is expressly prohibited.
+All forms of distribution of this code, whether as given or with
+any changes, are expressly prohibited.
+
+Authors: Diane Horton, David Liu, Mario Badr, Sophia Huynh, Misha Schwartz,
+and Jaisie Sin
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) Diane Horton, David Liu, Mario Badr, Sophia Huynh,
+Misha Schwartz, and Jaisie Sin
+
+=== Module Description ===
+
+This file contains functions that make moves on a board, one at a time or
+in batches.
+
+Each action in actions.py is looked up once in a table of functions that
+make it, instead of being compared against each kind of action in turn.
+A batch of moves is applied atomically: if any move in it cannot be made,
+the board is rolled back to how it was before the batch.
+
+The legal moves on a board can also be listed, or just counted, without
+trying any of them, and a MoveSampler picks one of them at random without
+trying moves until one works.
+"""
+from __future__ import annotations
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import random
+
+from actions import ROTATE_CLOCKWISE, ROTATE_COUNTER_CLOCKWISE, \
+    SWAP_HORIZONTAL, SWAP_VERTICAL, SMASH, COMBINE, PAINT, PASS, \
+    ACTION_PENALTY
+from block import Block, MoveJournal
+from settings import colour_index
+
+# For each action, a function that makes it on a Block, painting with the
+# given colour, and returns whether the move was made.
+_BLOCK_MOVES: Dict[Tuple[str, Optional[int]],
+                   Callable[[Block, Tuple[int, int, int]], bool]] = {
+    ROTATE_CLOCKWISE: lambda block, _: block.rotate(1),
+    ROTATE_COUNTER_CLOCKWISE: lambda block, _: block.rotate(3),
+    SWAP_HORIZONTAL: lambda block, _: block.swap(0),
+    SWAP_VERTICAL: lambda block, _: block.swap(1),
+    SMASH: lambda block, _: block.smash(),
+    COMBINE: lambda block, _: block.combine(),
+    PAINT: lambda block, colour: block.paint(colour),
+    PASS: lambda block, _: True
+}
+
+# For each action, a function that makes it on a Block through a MoveJournal,
+# painting with the given colour, and returns whether the move was made.
+_JOURNAL_MOVES: Dict[Tuple[str, Optional[int]],
+                     Callable[[MoveJournal, Block, Tuple[int, int, int]],
+                              bool]] = {
+    ROTATE_CLOCKWISE:
+        lambda journal, block, _: journal.rotate(block, 1),
+    ROTATE_COUNTER_CLOCKWISE:
+        lambda journal, block, _: journal.rotate(block, 3),
+    SWAP_HORIZONTAL:
+        lambda journal, block, _: journal.swap(block, 0),
+    SWAP_VERTICAL:
+        lambda journal, block, _: journal.swap(block, 1),
+    SMASH:
+        lambda journal, block, _: journal.smash(block),
+    COMBINE:
+        lambda journal, block, _: journal.combine(block),
+    PAINT:
+        lambda journal, block, colour: journal.paint(block, colour),
+    PASS:
+        lambda journal, block, _: True
+}
+
+
+# The actions that a player can make a move with, in the order that the
+# legal moves on a block are listed in. Passing is not included, since it is
+# always possible and changes nothing.
+PLAYER_ACTIONS = [ROTATE_CLOCKWISE, ROTATE_COUNTER_CLOCKWISE, SWAP_HORIZONTAL,
+                  SWAP_VERTICAL, SMASH, PAINT, COMBINE]
+
+# The actions that are legal on a Block with children, without and with a
+# combine, and on a leaf that can be smashed or painted, in the order of
+# PLAYER_ACTIONS.
+_RESHAPES = (ROTATE_CLOCKWISE, ROTATE_COUNTER_CLOCKWISE, SWAP_HORIZONTAL,
+             SWAP_VERTICAL)
+_RESHAPES_AND_COMBINE = _RESHAPES + (COMBINE,)
+_SMASH_ONLY = (SMASH,)
+_PAINT_ONLY = (PAINT,)
+
+
+def _legal_actions(block: Block,
+                   colour: int) -> Tuple[Tuple[str, Optional[int]], ...]:
+    """Return the actions other than a pass that can be made on <block>, in
+    the order of PLAYER_ACTIONS, where paints use the colour with palette
+    index <colour>. <block> is not changed.
+
+    Every other function in this module that decides which moves are legal
+    does it through this one.
+    """
+    if len(block.children) != 0:
+        if block.combinable():
+            return _RESHAPES_AND_COMBINE
+        return _RESHAPES
+    if block.smashable():
+        return _SMASH_ONLY
+    # A leaf that cannot be smashed is at max_depth, so it can be painted
+    # with any colour other than its own.
+    if block.colour_index != colour:
+        return _PAINT_ONLY
+    return ()
+
+
+def is_legal(block: Block, action: Tuple[str, Optional[int]],
+             colour: Tuple[int, int, int]) -> bool:
+    """Return True iff the move <action> can be made on <block>, painting
+    with <colour> if it is a paint. <block> is not changed.
+
+    >>> board = Block((0, 0), 750, (1, 128, 181), 0, 1)
+    >>> is_legal(board, SMASH, (1, 128, 181))
+    True
+    >>> is_legal(board, ROTATE_CLOCKWISE, (1, 128, 181))
+    False
+    """
+    return action == PASS or \
+        action in _legal_actions(block, colour_index(colour))
+
+
+def legal_moves(board: Block, colour: Tuple[int, int, int]) \
+        -> Iterator[Tuple[Tuple[int, ...], Tuple[str, Optional[int]]]]:
+    """Yield every move other than a pass that can be made on <board> or one
+    of its descendants, painting with <colour>, without making any of them.
+
+    Each move is a tuple of the path of child indices from <board> to the
+    Block to make it on, and the action. The Blocks are visited in
+    pre-order, and the actions on each Block are in the order of
+    PLAYER_ACTIONS.
+
+    >>> board = Block((0, 0), 750, (1, 128, 181), 0, 1)
+    >>> list(legal_moves(board, (1, 128, 181)))
+    [((), ('smash', None))]
+
+    The moves are exactly the ones that succeed when each action is tried
+    on each Block of a copy of the board:
+
+    >>> from block import all_blocks, generate_boards
+    >>> from settings import COLOUR_LIST
+    >>> agree = []
+    >>> for board in generate_boards(4, 3, 750, seed=24):
+    ...     ids = [id(block) for block in all_blocks(board)]
+    ...     for colour in COLOUR_LIST:
+    ...         tried = [(i, action)
+    ...                  for i in range(len(ids)) for action in PLAYER_ACTIONS
+    ...                  if apply_move(all_blocks(board.create_copy())[i],
+    ...                                action, colour)]
+    ...         found = [(ids.index(id(block_at(board, path))), action)
+    ...                  for path, action in legal_moves(board, colour)]
+    ...         agree.append(found == tried and
+    ...                      count_legal_moves(board, colour) == len(tried))
+    >>> len(agree), all(agree)
+    (16, True)
+    """
+    index = colour_index(colour)
+    stack = [((), board)]
+    while len(stack) != 0:
+        path, block = stack.pop()
+        for action in _legal_actions(block, index):
+            yield path, action
+        children = block.children
+        for i in range(len(children) - 1, -1, -1):
+            stack.append((path + (i,), children[i]))
+
+
+def count_legal_moves(board: Block, colour: Tuple[int, int, int]) -> int:
+    """Return the number of moves that legal_moves(board, colour) yields.
+
+    No paths are built, so this is quicker than counting them.
+    """
+    index = colour_index(colour)
+    count = 0
+    stack = [board]
+    while len(stack) != 0:
+        block = stack.pop()
+        count += len(_legal_actions(block, index))
+        stack.extend(block.children)
+    return count
+
+
+class MoveSampler:
+    """Picks moves other than a pass uniformly at random from the legal moves
+    on a list of Blocks.
+
+    The Blocks that each action is legal on are found once, when the sampler
+    is made, so each pick takes constant time. The sampler is only right as
+    long as the Blocks are not changed, or are changed back, for example by
+    rolling back a MoveJournal.
+
+    === Public Attributes ===
+    count:
+        The number of legal moves on the Blocks.
+    """
+    # === Private Attributes ===
+    # _eligible:
+    #   For each action in PLAYER_ACTIONS, in order, the action and the
+    #   indices in the list of Blocks of the Blocks it is legal on.
+    count: int
+    _eligible: List[Tuple[Tuple[str, Optional[int]], List[int]]]
+
+    def __init__(self, blocks: Sequence[Block],
+                 colour: Tuple[int, int, int]) -> None:
+        """Initialize a sampler of the legal moves on <blocks>, where paints
+        use <colour>.
+        """
+        index = colour_index(colour)
+        eligible = {action: [] for action in PLAYER_ACTIONS}
+        for i, block in enumerate(blocks):
+            for action in _legal_actions(block, index):
+                eligible[action].append(i)
+        self._eligible = list(eligible.items())
+        self.count = sum(len(indices) for _, indices in self._eligible)
+
+    def sample(self) -> Optional[Tuple[Tuple[str, Optional[int]], int]]:
+        """Return a legal move, picked uniformly at random, as the action and
+        the index of the Block to make it on. Return None if there are no
+        legal moves.
+
+        Every legal move is picked, and none is picked much more often than
+        another:
+
+        >>> from block import all_blocks, generate_boards
+        >>> board = generate_boards(1, 3, 750, seed=25)[0]
+        >>> blocks = all_blocks(board)
+        >>> ids = [id(block) for block in blocks]
+        >>> legal = {(action, ids.index(id(block_at(board, path))))
+        ...          for path, action in legal_moves(board, (1, 128, 181))}
+        >>> sampler = MoveSampler(blocks, (1, 128, 181))
+        >>> sampler.count == len(legal)
+        True
+        >>> random.seed(25)
+        >>> picks = {}
+        >>> for _ in range(200 * sampler.count):
+        ...     move = sampler.sample()
+        ...     picks[move] = picks.get(move, 0) + 1
+        >>> set(picks) == legal
+        True
+        >>> all(150 <= picks[move] <= 250 for move in legal)
+        True
+
+        A leaf that can neither be smashed nor painted has no legal moves:
+
+        >>> MoveSampler([Block((0, 0), 750, (1, 128, 181), 0, 0)],
+        ...             (1, 128, 181)).sample() is None
+        True
+        """
+        if self.count == 0:
+            return None
+        pick = random.randrange(self.count)
+        for action, indices in self._eligible:
+            if pick < len(indices):
+                return action, indices[pick]
+            pick -= len(indices)
+        return None
+
+
+def block_at(board: Block, path: Sequence[int]) -> Optional[Block]:
+    """Return the Block reached from <board> by following the child indices
+    in <path>, or None if there is no such Block.
+
+    >>> board = Block((0, 0), 750, (1, 128, 181), 0, 1)
+    >>> block_at(board, []) is board
+    True
+    >>> block_at(board, [2]) is None
+    True
+    """
+    block = board
+    for index in path:
+        children = block.children
+        if not 0 <= index < len(children):
+            return None
+        block = children[index]
+    return block
+
+
+def apply_move(block: Block, action: Tuple[str, Optional[int]],
+               colour: Tuple[int, int, int],
+               journal: Optional[MoveJournal] = None) -> bool:
+    """Make the move <action> on <block>, painting with <colour> if it is a
+    paint.
+
+    Return True iff the move was made. An action that is not in actions.py
+    is never made. If <journal> is not None, the move is made through it, so
+    it can be undone.
+    """
+    if journal is None:
+        move = _BLOCK_MOVES.get(action)
+        if move is None:
+            return False
+        return move(block, colour)
+    move = _JOURNAL_MOVES.get(action)
+    if move is None:
+        return False
+    return move(journal, block, colour)
+
+
+def apply_moves(board: Block,
+                moves: Sequence[Tuple[str, Optional[int], Sequence[int]]],
+                colour: Tuple[int, int, int],
+                journal: Optional[MoveJournal] = None) \
+        -> Tuple[List[bool], int, Optional[int]]:
+    """Make every move in <moves> on <board>, in order, or none of them.
+
+    Each move is a tuple of the name of the action, its direction (or None),
+    and the path of child indices from <board> to the Block to make it on.
+    Paints use <colour>.
+
+    Return a list that says, for each move, whether it was made, the total
+    penalty for the moves, as given by actions.ACTION_PENALTY, and None. If
+    a move cannot be made (including a move with an unknown action or a path
+    that leads nowhere), the moves before it are undone, so none of the
+    moves is made: the list is then all False, the penalty is 0, and the
+    last item is the index in <moves> of the move that could not be made.
+
+    If <journal> is not None, the moves are recorded in it, so the whole
+    batch can be undone later.
+
+    >>> board = Block((0, 0), 750, (1, 128, 181), 0, 1)
+    >>> apply_moves(board, [('smash', None, []), ('rotate', 1, [])],
+    ...             (1, 128, 181))
+    ([True, True], 3, None)
+    >>> apply_moves(board, [('rotate', 1, []), ('smash', None, [])],
+    ...             (1, 128, 181))
+    ([False, False], 0, 1)
+    """
+    if journal is None:
+        batch = MoveJournal()
+    else:
+        batch = journal
+    mark = batch.mark()
+    made = [False] * len(moves)
+    penalty = 0
+    for i, (name, direction, path) in enumerate(moves):
+        action = (name, direction)
+        move = _JOURNAL_MOVES.get(action)
+        block = block_at(board, path)
+        if move is None or block is None or not move(batch, block, colour):
+            batch.rollback(mark)
+            return [False] * len(moves), 0, i
+        made[i] = True
+        penalty += ACTION_PENALTY[action]
+    if journal is None:
+        batch.clear()
+    return made, penalty, None
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config={
+        'allowed-import-modules': [
+            'doctest', 'python_ta', 'random', 'typing', '__future__',
+            'actions', 'block', 'settings'
+        ],
+        'generated-members': 'pygame.*'
+    })
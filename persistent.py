@@ -0,0 +1,631 @@
+"""CSC148 Assignment 2
+
+=== CSC148 Winter 2020 ===
+Department of Computer Science,
+University of Toronto
+
+This code is provided solely for the personal and private use of
+students taking the CSC148 course at the University of Toronto.
+Copying for purposes other than this use is expressly prohibited.
+All forms of distribution of this code, whether as given or with
+any changes, are expressly prohibited.
+
+Authors: Diane Horton, David Liu, Mario Badr, Sophia Huynh, Misha Schwartz,
+and Jaisie Sin
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) Diane Horton, David Liu, Mario Badr, Sophia Huynh,
+Misha Schwartz, and Jaisie Sin
+
+=== Module Description ===
+
+This file contains a persistent version of the Blocky board. Its nodes are
+never changed once they are built, so copies of a board share every node
+that they have in common, and a move only builds new nodes along the path
+from the root to the block that it changes.
+
+A board can also keep its nodes in a NodeStore, which goes further and
+shares every subtree that is identical to another one, wherever it is.
+"""
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Tuple
+import math
+import random
+
+from block import Block, SWAP_ORDER, child_size, majority_colour
+from settings import colour_index, COLOUR_LIST, PALETTE
+
+
+class PersistentNode:
+    """An immutable square block in a persistent Blocky board.
+
+    A PersistentNode has the same tree-related attributes as a Block, so the
+    goals can score it, but it does not know its position: the same node may
+    appear in many boards.
+
+    === Public Attributes ===
+    size:
+        The height and width of this square block.
+    level:
+        The level of this block within the overall block structure.
+    max_depth:
+        The deepest level allowed in the overall block structure.
+
+    === Representation Invariants ===
+    - len(children) == 0 or len(children) == 4
+    - colour_index is None iff len(children) == 4
+    """
+    # === Private Attributes ===
+    # _colour:
+    #   The index of this block's colour in settings.PALETTE, or None if this
+    #   block has children.
+    # _children:
+    #   The children of this block, before <_turn> is applied to them.
+    # _turn:
+    #   The number of clockwise quarter turns that this block and all its
+    #   descendants have been rotated by, but that are not yet reflected in
+    #   <_children>.
+    # _turned:
+    #   The children of this block with <_turn> applied, once they have been
+    #   needed.
+    __slots__ = ('size', '_colour', 'level', 'max_depth', '_children',
+                 '_turn', '_turned')
+    size: int
+    level: int
+    max_depth: int
+    _colour: Optional[int]
+    _children: Tuple[PersistentNode, ...]
+    _turn: int
+    _turned: Optional[Tuple[PersistentNode, ...]]
+
+    def __init__(self, size: int, colour: Optional[int], level: int,
+                 max_depth: int,
+                 children: Tuple[PersistentNode, ...] = (),
+                 turn: int = 0) -> None:
+        """Initialize this node with dimensions <size> by <size>, the colour
+        with palette index <colour>, at <level>, with <children> rotated
+        clockwise by <turn> quarter turns.
+        """
+        self.size = size
+        self._colour = colour
+        self.level = level
+        self.max_depth = max_depth
+        self._children = children
+        self._turn = turn
+        self._turned = None
+
+    @property
+    def colour(self) -> Optional[Tuple[int, int, int]]:
+        """The colour of this block, or None if it has children.
+        """
+        if self._colour is None:
+            return None
+        return PALETTE[self._colour]
+
+    @property
+    def colour_index(self) -> Optional[int]:
+        """The index of this block's colour in settings.PALETTE, or None if it
+        has children.
+        """
+        return self._colour
+
+    @property
+    def children(self) -> Tuple[PersistentNode, ...]:
+        """The blocks into which this block is subdivided, in the same order
+        as Block.children.
+        """
+        if self._turn == 0:
+            return self._children
+        if self._turned is None:
+            turn = self._turn
+            kids = self._children
+            self._turned = tuple(kids[(i + turn) % 4].rotated(turn)
+                                 for i in range(4))
+        return self._turned
+
+    def rotated(self, turn: int) -> PersistentNode:
+        """Return this block rotated clockwise by <turn> quarter turns.
+        """
+        if len(self._children) == 0 or turn % 4 == 0:
+            return self
+        return PersistentNode(self.size, None, self.level, self.max_depth,
+                              self._children, (self._turn + turn) % 4)
+
+    def with_children(self, children: Tuple[PersistentNode, ...]) \
+            -> PersistentNode:
+        """Return a block like this one, but with <children>.
+        """
+        return PersistentNode(self.size, None, self.level, self.max_depth,
+                              children)
+
+    def with_colour(self, colour: int) -> PersistentNode:
+        """Return a leaf like this block, but with the colour that has palette
+        index <colour>.
+        """
+        return PersistentNode(self.size, colour, self.level, self.max_depth)
+
+
+class NodeStore:
+    """A table of PersistentNodes in which no two nodes are structurally
+    identical.
+
+    Whenever a node is asked for that has the same size, level, max_depth,
+    colour and children as one the store already has, the store hands back
+    the node it has. A node does not know its position, so identical
+    subtrees anywhere on a board, or on any board that uses the same store,
+    are a single shared node. Nodes from a store never have pending turns.
+
+    Two nodes from the same store are identical exactly when they are the
+    same object, so they can be compared with <is> and used as cache keys
+    without looking at their descendants.
+    """
+    # === Private Attributes ===
+    # _nodes:
+    #   Maps the size, level, max_depth, colour index and children of each
+    #   node in the store to that node.
+    # _rotations:
+    #   Maps a node and a number of clockwise quarter turns to the node that
+    #   is that node rotated by that many turns.
+    _nodes: Dict[Tuple, PersistentNode]
+    _rotations: Dict[Tuple[PersistentNode, int], PersistentNode]
+
+    def __init__(self) -> None:
+        """Initialize an empty store.
+        """
+        self._nodes = {}
+        self._rotations = {}
+
+    def __len__(self) -> int:
+        """Return the number of distinct nodes in this store.
+        """
+        return len(self._nodes)
+
+    def leaf(self, size: int, colour: int, level: int,
+             max_depth: int) -> PersistentNode:
+        """Return the leaf with dimensions <size> by <size>, the colour with
+        palette index <colour>, at <level>.
+        """
+        key = (size, level, max_depth, colour, ())
+        node = self._nodes.get(key)
+        if node is None:
+            node = PersistentNode(size, colour, level, max_depth)
+            self._nodes[key] = node
+        return node
+
+    def branch(self, size: int, level: int, max_depth: int,
+               children: Tuple[PersistentNode, ...]) -> PersistentNode:
+        """Return the block with dimensions <size> by <size>, at <level>, that
+        is subdivided into <children>.
+
+        Precondition: <children> all come from this store.
+        """
+        # The children are already unique, so they are compared by identity.
+        key = (size, level, max_depth, None, children)
+        node = self._nodes.get(key)
+        if node is None:
+            node = PersistentNode(size, None, level, max_depth, children)
+            self._nodes[key] = node
+        return node
+
+    def rotated(self, node: PersistentNode, turn: int) -> PersistentNode:
+        """Return <node> rotated clockwise by <turn> quarter turns.
+
+        Precondition: <node> comes from this store.
+        """
+        turn %= 4
+        if len(node.children) == 0 or turn == 0:
+            return node
+        rotated = self._rotations.get((node, turn))
+        if rotated is None:
+            kids = node.children
+            rotated = self.branch(node.size, node.level, node.max_depth,
+                                  tuple(self.rotated(kids[(i + turn) % 4],
+                                                     turn)
+                                        for i in range(4)))
+            self._rotations[(node, turn)] = rotated
+        return rotated
+
+    def intern(self, node: PersistentNode) -> PersistentNode:
+        """Return the node in this store that is identical to <node>.
+        """
+        if len(node.children) == 0:
+            return self.leaf(node.size, node.colour_index, node.level,
+                             node.max_depth)
+        return self.branch(node.size, node.level, node.max_depth,
+                           tuple(self.intern(child)
+                                 for child in node.children))
+
+
+def persistent_board(block: Block,
+                     store: Optional[NodeStore] = None) -> PersistentBoard:
+    """Return a new PersistentBoard holding a copy of <block> and all its
+    descendants.
+
+    If <store> is not None, the board keeps its nodes in <store>.
+
+    The board has the same blocks as <block>, with or without a store, and
+    later moves on <block> do not change it.
+
+    >>> from block import generate_boards
+    >>> boards = generate_boards(10, 4, 750, seed=5)
+    >>> all(_matches(persistent_board(block).root, block) and
+    ...     _matches(persistent_board(block, NodeStore()).root, block)
+    ...     for block in boards)
+    True
+    >>> block = boards[0]
+    >>> board = persistent_board(block)
+    >>> board.position == block.position
+    True
+    >>> block.rotate(1)
+    True
+    >>> _matches(board.root, block)
+    False
+    >>> _matches(persistent_board(block).root, block)
+    True
+    """
+    return PersistentBoard(block.position, _node_from_block(block, store),
+                           store)
+
+
+def _node_from_block(block: Block,
+                     store: Optional[NodeStore] = None) -> PersistentNode:
+    """Return a PersistentNode holding a copy of <block> and its descendants,
+    taken from <store> if it is not None.
+    """
+    children = tuple(_node_from_block(child, store)
+                     for child in block.children)
+    if store is None:
+        return PersistentNode(block.size, block.colour_index, block.level,
+                              block.max_depth, children)
+    elif len(children) == 0:
+        return store.leaf(block.size, block.colour_index, block.level,
+                          block.max_depth)
+    else:
+        return store.branch(block.size, block.level, block.max_depth,
+                            children)
+
+
+def _matches(node: PersistentNode, block: Block) -> bool:
+    """Return whether <node> and <block> have the same size, level, max_depth
+    and colour, and their children match in order.
+    """
+    if (node.size, node.level, node.max_depth, node.colour) != \
+            (block.size, block.level, block.max_depth, block.colour):
+        return False
+    children = block.children
+    return len(node.children) == len(children) and \
+        all(_matches(node.children[k], children[k])
+            for k in range(len(children)))
+
+
+def _random_children(node: PersistentNode,
+                     store: Optional[NodeStore] = None) \
+        -> Tuple[PersistentNode, ...]:
+    """Return four randomly generated children for <node>, taken from
+    <store> if it is not None.
+
+    Random numbers are drawn in the same order as Block.smash draws them.
+    """
+    colours = [colour_index(random.choice(COLOUR_LIST)) for _ in range(4)]
+    size = child_size(node.size)
+    level = node.level + 1
+    children = []
+    for colour in colours:
+        child = PersistentNode(size, colour, level, node.max_depth)
+        if random.random() < math.exp(-0.25 * level) and \
+                level != node.max_depth:
+            grandchildren = _random_children(child, store)
+            if store is None:
+                child = child.with_children(grandchildren)
+            else:
+                child = store.branch(size, level, node.max_depth,
+                                     grandchildren)
+        elif store is not None:
+            child = store.leaf(size, colour, level, node.max_depth)
+        children.append(child)
+    return tuple(children)
+
+
+class PersistentBoard:
+    """A Blocky board whose copies share structure.
+
+    A PersistentBoard refers to an immutable tree of PersistentNodes. Each
+    move builds a new tree that shares every node it does not change with
+    the old one, so copying a board takes constant time and a move builds
+    only as many nodes as the depth of the block it changes (plus the new
+    blocks made by a smash).
+
+    Blocks are identified by their path: the sequence of child indices that
+    leads from the root to the block.
+
+    Every move does to a board exactly what the same move does to the Block
+    it was built from, including the random blocks made by a smash:
+
+    >>> from block import all_blocks, generate_boards
+    >>> moves = [('smash',), ('swap', 0), ('swap', 1), ('rotate', 1),
+    ...          ('rotate', 3), ('paint', COLOUR_LIST[0]), ('combine',)]
+    >>> performed = {move: 0 for move in moves}
+    >>> mismatches = []
+    >>> for block in generate_boards(5, 3, 750, seed=9):
+    ...     for store in [None, NodeStore()]:
+    ...         board = persistent_board(block, store)
+    ...         for i in range(len(board.all_paths())):
+    ...             for move in moves:
+    ...                 copy = block.create_copy()
+    ...                 other = board.create_copy()
+    ...                 random.seed(i)
+    ...                 done = getattr(all_blocks(copy)[i], move[0])(*move[1:])
+    ...                 random.seed(i)
+    ...                 target = other.blocks(other.all_paths())[i]
+    ...                 if getattr(target, move[0])(*move[1:]) != done or \\
+    ...                         not _matches(other.root, copy):
+    ...                     mismatches.append((i, move))
+    ...                 performed[move] += done
+    >>> mismatches
+    []
+    >>> all(count > 0 for count in performed.values())
+    True
+
+    === Public Attributes ===
+    position:
+        The (x, y) coordinates of the upper left corner of the board.
+    root:
+        The root of the tree of blocks.
+    store:
+        The NodeStore that every node of this board comes from, or None if
+        the nodes are not shared that way.
+    """
+    position: Tuple[int, int]
+    root: PersistentNode
+    store: Optional[NodeStore]
+
+    def __init__(self, position: Tuple[int, int], root: PersistentNode,
+                 store: Optional[NodeStore] = None) -> None:
+        """Initialize this board with its upper left corner at <position> and
+        the tree rooted at <root>, keeping its nodes in <store> if it is not
+        None.
+        """
+        self.position = position
+        self.store = store
+        if store is None:
+            self.root = root
+        else:
+            self.root = store.intern(root)
+
+    def create_copy(self) -> PersistentBoard:
+        """Return a copy of this board.
+
+        The copy shares all of its nodes with this board, so this takes
+        constant time.
+        """
+        copy = PersistentBoard(self.position, self.root)
+        copy.store = self.store
+        return copy
+
+    def node(self, path: Sequence[int]) -> PersistentNode:
+        """Return the node at <path>.
+        """
+        node = self.root
+        for k in path:
+            node = node.children[k]
+        return node
+
+    def all_paths(self) -> List[Tuple[int, ...]]:
+        """Return the paths of all the blocks on this board, in the same order
+        as player._board_all_blocks lists them.
+        """
+        paths = []
+        stack = [((), self.root)]
+        while stack:
+            path, node = stack.pop()
+            paths.append(path)
+            children = node.children
+            for k in range(len(children) - 1, -1, -1):
+                stack.append((path + (k,), children[k]))
+        return paths
+
+    def blocks(self, paths: Sequence[Tuple[int, ...]]) -> BlockSequence:
+        """Return a sequence of the blocks of this board at <paths>.
+        """
+        return BlockSequence(self, paths)
+
+    def _replace(self, path: Sequence[int], new: PersistentNode) -> None:
+        """Make <new> the node at <path>, building new ancestors for it.
+        """
+        nodes = [self.root]
+        for k in path[:-1]:
+            nodes.append(nodes[-1].children[k])
+        for depth in range(len(path) - 1, -1, -1):
+            children = list(nodes[depth].children)
+            children[path[depth]] = new
+            new = self._with_children(nodes[depth], tuple(children))
+        self.root = new
+
+    def _with_children(self, node: PersistentNode,
+                       children: Tuple[PersistentNode, ...]) \
+            -> PersistentNode:
+        """Return a node like <node>, but with <children>, from this board's
+        store if it has one.
+        """
+        if self.store is None:
+            return node.with_children(children)
+        return self.store.branch(node.size, node.level, node.max_depth,
+                                 children)
+
+    def _with_colour(self, node: PersistentNode,
+                     colour: int) -> PersistentNode:
+        """Return a leaf like <node>, but with the colour that has palette
+        index <colour>, from this board's store if it has one.
+        """
+        if self.store is None:
+            return node.with_colour(colour)
+        return self.store.leaf(node.size, colour, node.level, node.max_depth)
+
+    def smash(self, path: Sequence[int]) -> bool:
+        """Sub-divide the block at <path> so that it has four randomly
+        generated children.
+
+        Return True iff the smash was performed.
+        """
+        node = self.node(path)
+        if node.level == node.max_depth or len(node.children) != 0:
+            return False
+        self._replace(path, self._with_children(
+            node, _random_children(node, self.store)))
+        return True
+
+    def swap(self, path: Sequence[int], direction: int) -> bool:
+        """Swap the children of the block at <path> horizontally if
+        <direction> is 0, or vertically if <direction> is 1.
+
+        Return True iff the swap was performed.
+        """
+        node = self.node(path)
+        if len(node.children) == 0:
+            return False
+        children = node.children
+        self._replace(path, self._with_children(
+            node, tuple(children[k] for k in SWAP_ORDER[direction])))
+        return True
+
+    def rotate(self, path: Sequence[int], direction: int) -> bool:
+        """Rotate the block at <path> and all its descendants, clockwise if
+        <direction> is 1 or counter-clockwise if <direction> is 3.
+
+        Return True iff the rotate was performed.
+        """
+        node = self.node(path)
+        if len(node.children) == 0:
+            return False
+        if self.store is None:
+            self._replace(path, node.rotated(direction))
+        else:
+            self._replace(path, self.store.rotated(node, direction))
+        return True
+
+    def paint(self, path: Sequence[int],
+              colour: Tuple[int, int, int]) -> bool:
+        """Change the colour of the block at <path> iff it is a leaf at a level
+        of max_depth and its colour is different from <colour>.
+
+        Return True iff the colour was changed.
+        """
+        node = self.node(path)
+        index = colour_index(colour)
+        if len(node.children) != 0 or node.level != node.max_depth or \
+                node.colour_index == index:
+            return False
+        self._replace(path, self._with_colour(node, index))
+        return True
+
+    def combine(self, path: Sequence[int]) -> bool:
+        """Turn the block at <path> into a leaf based on the majority colour of
+        its children, as Block.combine does.
+
+        Return True iff the block was turned into a leaf.
+        """
+        node = self.node(path)
+        if len(node.children) == 0 or node.level != node.max_depth - 1:
+            return False
+        majority = majority_colour([child.colour_index
+                                    for child in node.children])
+        if majority is None:
+            return False
+        self._replace(path, self._with_colour(node, majority))
+        return True
+
+
+class PersistentBlock:
+    """The block at a fixed path of a PersistentBoard, with the moves of a
+    Block.
+
+    === Public Attributes ===
+    board:
+        The board this block belongs to.
+    path:
+        The child indices that lead from the root of <board> to this block.
+    """
+    board: PersistentBoard
+    path: Tuple[int, ...]
+
+    def __init__(self, board: PersistentBoard,
+                 path: Tuple[int, ...]) -> None:
+        """Initialize this block as the block at <path> in <board>.
+        """
+        self.board = board
+        self.path = path
+
+    def smash(self) -> bool:
+        """Sub-divide this block so that it has four randomly generated
+        children. Return True iff the smash was performed.
+        """
+        return self.board.smash(self.path)
+
+    def swap(self, direction: int) -> bool:
+        """Swap the child blocks of this block. Return True iff the swap was
+        performed.
+        """
+        return self.board.swap(self.path, direction)
+
+    def rotate(self, direction: int) -> bool:
+        """Rotate this block and all its descendants. Return True iff the
+        rotate was performed.
+        """
+        return self.board.rotate(self.path, direction)
+
+    def paint(self, colour: Tuple[int, int, int]) -> bool:
+        """Change this block's colour iff it is a leaf at a level of max_depth
+        and its colour is different from <colour>.
+        """
+        return self.board.paint(self.path, colour)
+
+    def combine(self) -> bool:
+        """Turn this block into a leaf based on the majority colour of its
+        children. Return True iff this block was turned into a leaf.
+        """
+        return self.board.combine(self.path)
+
+
+class BlockSequence:
+    """A sequence of the blocks at given paths of a PersistentBoard.
+
+    The PersistentBlocks are only made when they are looked up, so building a
+    BlockSequence for a fresh copy of a board takes constant time.
+    """
+    # === Private Attributes ===
+    # _board:
+    #   The board the blocks belong to.
+    # _paths:
+    #   The paths of the blocks, in order.
+    _board: PersistentBoard
+    _paths: Sequence[Tuple[int, ...]]
+
+    def __init__(self, board: PersistentBoard,
+                 paths: Sequence[Tuple[int, ...]]) -> None:
+        """Initialize this sequence of the blocks of <board> at <paths>.
+        """
+        self._board = board
+        self._paths = paths
+
+    def __len__(self) -> int:
+        """Return the number of blocks in this sequence.
+        """
+        return len(self._paths)
+
+    def __getitem__(self, index: int) -> PersistentBlock:
+        """Return the block at <index> in this sequence.
+        """
+        return PersistentBlock(self._board, self._paths[index])
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'allowed-import-modules': [
+            'doctest', 'python_ta', 'random', 'typing', '__future__', 'math',
+            'block', 'settings'
+        ],
+        'max-attributes': 15,
+        'max-args': 7
+    })
@@ -0,0 +1,571 @@
+"""CSC148 Assignment 2
+
+=== CSC148 Winter 2020 ===
+Department of Computer Science,
+University of Toronto
+
+This code is provided solely for the personal and private use of
+students taking the CSC148 course at the University of Toronto.
+Copying for purposes other than this use is expressly prohibited.
+All forms of distribution of this code, whether as given or with
+any changes, are expressly prohibited.
+
+Authors: Diane Horton, David Liu, Mario Badr, Sophia Huynh, Misha Schwartz,
+and Jaisie Sin
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) Diane Horton, David Liu, Mario Badr, Sophia Huynh,
+Misha Schwartz, and Jaisie Sin
+
+=== Module Description ===
+
+This file contains the raster engine, which turns a board into a grid of
+unit cells.
+
+A grid holds the index in settings.PALETTE of the colour of each unit cell
+of a board. It is indexed by column and then row: grid[x][y] is the unit
+cell in column x and row y, and grid[0][0] is the upper left corner of the
+board.
+
+Each leaf of the board is painted into a grid that is allocated once, by
+slice assignment, instead of building nested lists for every block. If
+NumPy is installed, a grid is a two-dimensional NumPy array of uint8.
+Otherwise, it is a list of bytearrays, one per column.
+
+A RasterCache keeps the grid of a board up to date as moves are made on it.
+After a move, only the area of the board that the move changed is painted
+again. It is a standalone utility: the game does not use one, since the
+goals score a board by walking its tree and never build its grid.
+
+The grids of many boards of the same size can be stacked, so that the goals
+can score all of them at once. With NumPy, a stack is scored with a handful
+of array operations, however many boards are in it.
+
+label_components finds the blobs of every colour in a grid in one pass, for
+code that needs to know which blob each unit cell is in.
+"""
+from __future__ import annotations
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from block import Block
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# A grid of unit cells: a NumPy array if NumPy is installed, or a list of
+# bytearrays otherwise. Both are indexed as grid[x][y].
+Grid = Any
+
+
+def new_grid(width: int) -> Grid:
+    """Return a grid of <width> by <width> unit cells, each holding 0.
+    """
+    if numpy is not None:
+        return numpy.zeros((width, width), dtype=numpy.uint8)
+    return [bytearray(width) for _ in range(width)]
+
+
+def fill(grid: Grid, x: int, y: int, width: int, colour: int) -> None:
+    """Set every unit cell of the <width> by <width> square of <grid> whose
+    upper left cell is in column <x> and row <y> to <colour>.
+    """
+    if numpy is not None:
+        grid[x:x + width, y:y + width] = colour
+    else:
+        cells = bytes((colour,)) * width
+        for column in range(x, x + width):
+            grid[column][y:y + width] = cells
+
+
+def paint(grid: Grid, block: Block, x: int, y: int) -> None:
+    """Paint every leaf of <block> into <grid>, with the upper left unit cell
+    of <block> in column <x> and row <y>.
+    """
+    stack = [(block, x, y, 2 ** (block.max_depth - block.level))]
+    while len(stack) != 0:
+        block, x, y, width = stack.pop()
+        children = block.children
+        if len(children) == 0:
+            fill(grid, x, y, width, block.colour_index)
+        else:
+            half = width // 2
+            stack.append((children[0], x + half, y, half))
+            stack.append((children[1], x, y, half))
+            stack.append((children[2], x, y + half, half))
+            stack.append((children[3], x + half, y + half, half))
+
+
+def rasterize(block: Block) -> Grid:
+    """Return a new grid of the unit cells of <block>.
+
+    >>> board = Block((0, 0), 750, (1, 128, 181), 0, 1)
+    >>> board.smash()
+    True
+    >>> to_lists(rasterize(board)) == [[board.children[1].colour_index,
+    ...                                 board.children[2].colour_index],
+    ...                                [board.children[0].colour_index,
+    ...                                 board.children[3].colour_index]]
+    True
+    """
+    grid = new_grid(2 ** (block.max_depth - block.level))
+    paint(grid, block, 0, 0)
+    return grid
+
+
+def stack(boards: Sequence[Block]) -> Grid:
+    """Return the grids of <boards>, stacked so that the first index selects a
+    board.
+
+    If NumPy is installed, this is a three-dimensional NumPy array of uint8.
+    Otherwise, it is a list of grids.
+
+    Precondition: every board in <boards> has the same max_depth - level.
+    """
+    width = 2 ** (boards[0].max_depth - boards[0].level) \
+        if len(boards) != 0 else 1
+    if numpy is None:
+        return [rasterize(board) for board in boards]
+    grids = numpy.zeros((len(boards), width, width), dtype=numpy.uint8)
+    for grid, board in zip(grids, boards):
+        paint(grid, board, 0, 0)
+    return grids
+
+
+def is_stack(value: Any) -> bool:
+    """Return True iff <value> is a stack of grids, as returned by stack,
+    rather than a sequence of boards.
+
+    Precondition: len(value) > 0
+
+    >>> board = Block((0, 0), 750, (1, 128, 181), 0, 1)
+    >>> is_stack(stack([board]))
+    True
+    >>> is_stack([board])
+    False
+    """
+    if numpy is not None and isinstance(value, numpy.ndarray):
+        return True
+    grid = value[0]
+    if numpy is not None and isinstance(grid, numpy.ndarray):
+        return True
+    return isinstance(grid, list) and len(grid) != 0 and \
+        isinstance(grid[0], bytearray)
+
+
+def edge_counts(grids: Grid, colour: int) -> List[int]:
+    """Return, for each grid in the stack <grids>, the number of unit cells
+    along its four sides that hold <colour>. The unit cells in the corners
+    count twice.
+    """
+    if numpy is not None:
+        cells = numpy.asarray(grids) == colour
+        counts = (cells[:, 0, :].sum(axis=1) + cells[:, -1, :].sum(axis=1) +
+                  cells[:, :, 0].sum(axis=1) + cells[:, :, -1].sum(axis=1))
+        return counts.tolist()
+    counts = []
+    for grid in grids:
+        count = grid[0].count(colour) + grid[-1].count(colour)
+        for column in grid:
+            count += (column[0] == colour) + (column[-1] == colour)
+        counts.append(count)
+    return counts
+
+
+def _label_equal(cells: Any, colour: Optional[int] = None) -> Any:
+    """Return an array of the same shape as the NumPy array <cells>, holding
+    a label for each unit cell, such that two unit cells have the same label
+    iff they are connected by unit cells that hold the same value.
+
+    If <colour> is not None, only the labels of the unit cells that hold
+    <colour> are worked out. The other unit cells are still labelled, but
+    not necessarily in this way.
+
+    The last two axes of <cells> are the columns and rows of grids, and any
+    axes before them select a grid. Each label is the position in
+    <cells>.ravel() of a unit cell with that label.
+
+    Each run of unit cells in a column that hold the same value is labelled
+    with the position of its top cell first. Runs in neighbouring columns
+    that touch are then joined with a union-find structure whose operations
+    are done on every pair at once: each round points the root of the higher
+    label of each pair that is not joined yet at the lower one. Only a few
+    rounds are needed, even for long, winding blobs.
+    """
+    positions = numpy.arange(cells.size).reshape(cells.shape)
+    starts = numpy.ones(cells.shape, dtype=bool)
+    starts[..., 1:] = cells[..., 1:] != cells[..., :-1]
+    labels = numpy.maximum.accumulate(numpy.where(starts, positions, 0),
+                                      axis=-1).ravel()
+
+    same = cells[..., 1:, :] == cells[..., :-1, :]
+    if colour is not None:
+        same &= cells[..., 1:, :] == colour
+    first = labels[positions[..., :-1, :][same]]
+    second = labels[positions[..., 1:, :][same]]
+    while True:
+        apart = first != second
+        if not apart.any():
+            return labels.reshape(cells.shape)
+        first = first[apart]
+        second = second[apart]
+        labels[numpy.maximum(first, second)] = numpy.minimum(first, second)
+        # Point every label straight at its root, doubling the distance each
+        # label jumps each time, and move both ends of each pair to their
+        # roots.
+        while True:
+            jumped = labels[labels]
+            if numpy.array_equal(jumped, labels):
+                break
+            labels = jumped
+        first = labels[first]
+        second = labels[second]
+
+
+def _flood(grid: Grid, labels: List[List[int]], x: int, y: int,
+           label: int) -> int:
+    """Set <label> in <labels> for every unit cell of the blob of <grid> that
+    the cell in column <x> and row <y> is in, and return the size of the
+    blob.
+
+    A blob is a set of unit cells of the same colour that are connected
+    through their sides. <labels> is indexed like <grid>, and holds -1 for
+    every unit cell that has not been given a label yet. The blob is visited
+    one unit cell at a time, with an explicit stack instead of recursion, so
+    that large blobs do not reach Python's recursion limit.
+    """
+    width = len(grid)
+    colour = grid[x][y]
+    labels[x][y] = label
+    size = 0
+    cells = [(x, y)]
+    while len(cells) != 0:
+        i, j = cells.pop()
+        size += 1
+        for a, b in ((i + 1, j), (i - 1, j), (i, j + 1), (i, j - 1)):
+            if 0 <= a < width and 0 <= b < width and \
+                    labels[a][b] == -1 and grid[a][b] == colour:
+                labels[a][b] = label
+                cells.append((a, b))
+    return size
+
+
+def _largest_blob_in(grid: Grid, colour: int) -> int:
+    """Return the size of the largest connected blob of unit cells of <colour>
+    in the list of bytearrays <grid>.
+    """
+    width = len(grid)
+    labels = [[-1] * width for _ in range(width)]
+    best = 0
+    for x in range(width):
+        for y in range(width):
+            if grid[x][y] == colour and labels[x][y] == -1:
+                best = max(best, _flood(grid, labels, x, y, 0))
+    return best
+
+
+def largest_blobs(grids: Grid, colour: int) -> List[int]:
+    """Return, for each grid in the stack <grids>, the size of its largest
+    connected blob of unit cells that hold <colour>.
+
+    With NumPy, the blobs of every grid in the stack are labelled together.
+    Either way, they are the same blobs as flood filling each grid finds:
+
+    >>> from block import generate_boards
+    >>> boards = generate_boards(40, 5, 750, seed=21)
+    >>> grids = stack(boards)
+    >>> all(largest_blobs(grids, colour) ==
+    ...     [_largest_by_flood(rasterize(board)).get(colour, 0)
+    ...      for board in boards]
+    ...     for colour in range(4))
+    True
+    """
+    if numpy is None:
+        return [_largest_blob_in(grid, colour) for grid in grids]
+    grids = numpy.asarray(grids)
+    if grids.size == 0:
+        return [0] * len(grids)
+    cells = grids == colour
+    labels = _label_equal(grids, colour)[cells]
+    sizes = numpy.bincount(labels)
+    roots = numpy.flatnonzero(sizes)
+    largest = numpy.zeros(len(grids), dtype=numpy.int64)
+    numpy.maximum.at(largest, roots // grids[0].size, sizes[roots])
+    return largest.tolist()
+
+
+def _label_in(grid: Grid) -> Tuple[List[List[int]], List[int], List[int]]:
+    """Return the blobs of the list of bytearrays <grid>, as described in
+    label_components, and the colour and size of each blob.
+    """
+    width = len(grid)
+    labels = [[-1] * width for _ in range(width)]
+    colours = []
+    sizes = []
+    for x in range(width):
+        for y in range(width):
+            if labels[x][y] == -1:
+                colours.append(grid[x][y])
+                sizes.append(_flood(grid, labels, x, y, len(sizes)))
+    return labels, colours, sizes
+
+
+def _largest_by_flood(grid: Grid) -> Dict[int, int]:
+    """Return the size of the largest blob of each colour in <grid>, by
+    palette index, found by flood filling <grid> one unit cell at a time.
+
+    This is slow, but simple enough to check the quicker ways of finding
+    blobs against.
+
+    >>> board = Block((0, 0), 750, (1, 128, 181), 0, 2)
+    >>> _largest_by_flood(rasterize(board))
+    {0: 16}
+    """
+    _, colours, sizes = _label_in(grid)
+    ans = {}
+    for colour, size in zip(colours, sizes):
+        ans[int(colour)] = max(ans.get(int(colour), 0), size)
+    return ans
+
+
+def label_components(grid: Grid) -> Tuple[Any, Dict[int, List[int]]]:
+    """Return a label map of the blobs of every colour in <grid>, and the
+    sizes of the blobs of each colour.
+
+    A blob is a set of unit cells of the same colour that are connected
+    through their sides. The blobs are numbered from 0, and the label map
+    holds the number of the blob that each unit cell is in, indexed by
+    column and then row like <grid>. It is a NumPy array if NumPy is
+    installed, and a list of lists otherwise.
+
+    The sizes are given by palette index, each in a list from the largest
+    blob of that colour to the smallest. Every colour is labelled in the same
+    pass, so this takes about as long whatever the number of colours.
+
+    >>> board = Block((0, 0), 750, (1, 128, 181), 0, 1)
+    >>> labels, sizes = label_components(rasterize(board))
+    >>> sizes[board.colour_index]
+    [4]
+
+    The blobs are the same as the ones found by flood filling the grid: two
+    unit cells are in the same blob in one iff they are in the other.
+
+    >>> from block import generate_boards
+    >>> def same_blobs(grid):
+    ...     labels, _ = label_components(grid)
+    ...     flood, _, _ = _label_in(grid)
+    ...     pairs = {(labels[x][y], flood[x][y])
+    ...              for x in range(len(grid)) for y in range(len(grid))}
+    ...     return (len(pairs) == len({a for a, _ in pairs}) ==
+    ...             len({b for _, b in pairs}))
+    >>> all(same_blobs(rasterize(board))
+    ...     for board in generate_boards(40, 5, 750, seed=22))
+    True
+    """
+    if numpy is None:
+        labels, colours, blob_sizes = _label_in(grid)
+    else:
+        grid = numpy.asarray(grid)
+        positions = _label_equal(grid).ravel()
+        counts = numpy.bincount(positions, minlength=grid.size)
+        roots = numpy.flatnonzero(counts)
+        numbers = numpy.zeros(grid.size, dtype=numpy.int64)
+        numbers[roots] = numpy.arange(len(roots))
+        labels = numbers[positions].reshape(grid.shape)
+        colours = grid.ravel()[roots].tolist()
+        blob_sizes = counts[roots].tolist()
+
+    sizes = {}
+    for colour, size in zip(colours, blob_sizes):
+        sizes.setdefault(colour, []).append(size)
+    for colour_sizes in sizes.values():
+        colour_sizes.sort(reverse=True)
+    return labels, sizes
+
+
+def to_lists(grid: Grid) -> List[List[int]]:
+    """Return the unit cells of <grid> as a list of columns, each a list of
+    palette indices.
+    """
+    if numpy is not None:
+        return grid.tolist()
+    return [list(column) for column in grid]
+
+
+def most_common(grid: Grid, x: int = 0, y: int = 0,
+                width: Optional[int] = None) -> int:
+    """Return the palette index that the most unit cells of the <width> by
+    <width> square of <grid> whose upper left cell is in column <x> and row
+    <y> hold. If <width> is None, the whole of <grid> is used.
+
+    If several indices are held by the same number of unit cells, the
+    smallest of them is returned.
+    """
+    if width is None:
+        width = len(grid)
+    if numpy is not None:
+        square = grid[x:x + width, y:y + width]
+        return int(numpy.bincount(square.ravel()).argmax())
+    counts = Counter()
+    for column in grid[x:x + width]:
+        counts.update(column[y:y + width])
+    return max(sorted(counts), key=counts.get)
+
+
+class RasterCache:
+    """A grid of the unit cells of a board, which is only painted again where
+    the board has changed.
+
+    The cache observes its board, so it knows which areas of the board the
+    moves made since its grid was last brought up to date changed. The grid
+    of a board that has not changed since it was last asked for is not
+    painted again at all:
+
+    >>> board = Block((0, 0), 750, (1, 128, 181), 0, 2)
+    >>> cache = RasterCache(board)
+    >>> _ = cache.grid()
+    >>> _ = cache.grid()
+    >>> cache.hits, cache.misses
+    (1, 1)
+    >>> board.smash()
+    True
+    >>> _ = cache.grid()
+    >>> _ = cache.grid()
+    >>> cache.hits, cache.misses
+    (2, 2)
+    >>> cache.close()
+
+    === Public Attributes ===
+    board:
+        The board that this cache holds the grid of.
+    hits:
+        The number of times the grid was asked for and was already up to
+        date.
+    misses:
+        The number of times the grid was asked for and had to be painted,
+        in whole or in part.
+    """
+    # === Private Attributes ===
+    # _grid:
+    #   The grid of <board>, or None if it has not been painted yet.
+    # _version:
+    #   The version of <board> that <_grid> is up to date for, or None.
+    # _dirty:
+    #   The paths of child indices from <board> to the blocks that moves have
+    #   been made on since <_grid> was last brought up to date.
+    board: Block
+    hits: int
+    misses: int
+    _grid: Optional[Grid]
+    _version: Optional[int]
+    _dirty: List[Tuple[int, ...]]
+
+    def __init__(self, board: Block) -> None:
+        """Initialize a cache of the grid of <board>, and start observing
+        <board>.
+
+        The grid is not painted until it is first asked for.
+        """
+        self.board = board
+        self.hits = 0
+        self.misses = 0
+        self._grid = None
+        self._version = None
+        self._dirty = []
+        board.add_observer(self._observe)
+
+    def close(self) -> None:
+        """Stop observing the board. The grid is not updated after this.
+        """
+        self.board.remove_observer(self._observe)
+
+    def _observe(self, _action: str, path: Tuple[int, ...],
+                 _box: Tuple[int, int, int, int]) -> None:
+        """Record that a move was made on the block at <path>.
+        """
+        if self._grid is not None:
+            self._dirty.append(path)
+
+    def grid(self) -> Grid:
+        """Return the grid of the board as it is now.
+
+        The grid is shared with later calls, so it must not be changed.
+
+        However many moves have been made since the last call, the parts of
+        the grid that are painted again make it the same as a new grid of
+        the board:
+
+        >>> import random
+        >>> from block import all_blocks, generate_board
+        >>> random.seed(20)
+        >>> board = generate_board(4, 750)
+        >>> cache = RasterCache(board)
+        >>> up_to_date = []
+        >>> for _ in range(300):
+        ...     block = random.choice(all_blocks(board))
+        ...     _ = random.choice([block.smash, block.combine,
+        ...                        lambda: block.rotate(1),
+        ...                        lambda: block.swap(0),
+        ...                        lambda: block.paint((199, 44, 58))])()
+        ...     if random.random() < 0.5:
+        ...         up_to_date.append(to_lists(cache.grid()) ==
+        ...                           to_lists(rasterize(board)))
+        >>> all(up_to_date)
+        True
+        >>> cache.close()
+        """
+        board = self.board
+        if self._grid is not None and self._version == board.version:
+            self.hits += 1
+            return self._grid
+        self.misses += 1
+        if self._grid is None:
+            self._grid = rasterize(board)
+        else:
+            # Every move changes a whole block, and blocks are either nested
+            # or apart, so the blocks of the paths that are not inside another
+            # one cover every unit cell that changed.
+            outermost = []
+            for path in sorted(set(self._dirty)):
+                if len(outermost) == 0 or \
+                        path[:len(outermost[-1])] != outermost[-1]:
+                    outermost.append(path)
+            for path in outermost:
+                self._repaint(path)
+        self._dirty = []
+        self._version = board.version
+        return self._grid
+
+    def _repaint(self, path: Tuple[int, ...]) -> None:
+        """Paint the block at <path> in the board into the grid again.
+
+        If a later move removed the block at <path>, the deepest block along
+        <path> that is still there is painted instead.
+        """
+        block = self.board
+        x = 0
+        y = 0
+        width = 2 ** (block.max_depth - block.level)
+        for index in path:
+            children = block.children
+            if index >= len(children):
+                break
+            width //= 2
+            if index in (0, 3):
+                x += width
+            if index in (2, 3):
+                y += width
+            block = children[index]
+        paint(self._grid, block, x, y)
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config={
+        'allowed-import-modules': [
+            'doctest', 'python_ta', 'typing', '__future__', 'collections',
+            'numpy', 'block'
+        ]
+    })
@@ -0,0 +1,312 @@
+"""CSC148 Assignment 2
+
+=== CSC148 Winter 2020 ===
+Department of Computer Science,
+University of Toronto
+
+This code is provided solely for the personal and private use of
+students taking the CSC148 course at the University of Toronto.
+Copying for purposes other than this use is expressly prohibited.
+All forms of distribution of this code, whether as given or with
+any changes, are expressly prohibited.
+
+Authors: Diane Horton, David Liu, Mario Badr, Sophia Huynh, Misha Schwartz,
+and Jaisie Sin
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) Diane Horton, David Liu, Mario Badr, Sophia Huynh,
+Misha Schwartz, and Jaisie Sin
+
+=== Module Description ===
+
+This file contains a compact binary format for saving and loading boards.
+
+A board is saved as one record, which is made up of:
+- a header: the magic bytes b'BLKY', the format version, the level,
+  max_depth, size and position of the board, the number of colours in the
+  record's palette, the number of structure bits and the number of leaves;
+- the record's palette: the RGB value of each colour used on the board, in
+  the order of their indices in settings.PALETTE;
+- the structure: one bit for each block in pre-order that says whether it
+  has children. Blocks at max_depth can never have children, so they get
+  no bit;
+- the colours: the index in the record's palette of the colour of each
+  block that has no children, in pre-order, packed 1, 2, 4 or 8 bits each.
+
+The header says how long the rest of the record is, so records can be
+written one after another to a file and read back in order. A depth 5 board
+takes about a hundred bytes.
+"""
+from __future__ import annotations
+from typing import BinaryIO, Iterator, List, Tuple, Union
+import mmap
+import struct
+
+from block import Block, child_size
+from settings import PALETTE
+
+# The bytes that every record starts with.
+MAGIC = b'BLKY'
+
+# The version of the format that this module writes. Records with any other
+# version are rejected.
+VERSION = 1
+
+# The magic bytes, version, level, max_depth, palette length, size, x, y,
+# number of structure bits and number of leaves, all little-endian.
+_HEADER = struct.Struct('<4sBBBBIIIII')
+
+# Anything that records can be decoded from without copying them.
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+def _colour_width(num_colours: int) -> int:
+    """Return the number of bits used to store one of <num_colours> colour
+    indices.
+
+    The width is always 1, 2, 4 or 8, so that no index is split between two
+    bytes.
+
+    >>> _colour_width(1)
+    1
+    >>> _colour_width(4)
+    2
+    >>> _colour_width(5)
+    4
+    """
+    width = 1
+    while (1 << width) < num_colours:
+        width *= 2
+    return width
+
+
+def _pack(values: List[int], width: int) -> bytes:
+    """Return <values> packed <width> bits each, starting from the lowest
+    bits of the first byte.
+
+    >>> _pack([1, 0, 3, 2], 2)
+    b'\\xb1'
+    """
+    per_byte = 8 // width
+    packed = bytearray((len(values) + per_byte - 1) // per_byte)
+    for i, value in enumerate(values):
+        packed[i // per_byte] |= value << (width * (i % per_byte))
+    return bytes(packed)
+
+
+def _unpack(view: memoryview, count: int, width: int) -> List[int]:
+    """Return the first <count> values of <width> bits each that are packed
+    in <view>.
+
+    >>> _unpack(memoryview(b'\\xb1'), 4, 2)
+    [1, 0, 3, 2]
+    """
+    per_byte = 8 // width
+    mask = (1 << width) - 1
+    return [(view[i // per_byte] >> (width * (i % per_byte))) & mask
+            for i in range(count)]
+
+
+def _packed_length(count: int, width: int) -> int:
+    """Return the number of bytes that <count> values of <width> bits each
+    take up when packed.
+    """
+    per_byte = 8 // width
+    return (count + per_byte - 1) // per_byte
+
+
+def dumps(board: Block) -> bytes:
+    """Return <board> encoded as one record.
+
+    >>> board = Block((0, 0), 750, PALETTE[0], 0, 1)
+    >>> len(dumps(board))
+    33
+    """
+    structure = []
+    leaves = []
+    stack = [board]
+    while len(stack) != 0:
+        block = stack.pop()
+        children = block.children
+        if block.level != block.max_depth:
+            structure.append(1 if len(children) != 0 else 0)
+        if len(children) == 0:
+            leaves.append(block.colour_index)
+        else:
+            stack.extend(reversed(children))
+
+    used = sorted(set(leaves))
+    local = {index: i for i, index in enumerate(used)}
+    width = _colour_width(len(used))
+    x, y = board.position
+    header = _HEADER.pack(MAGIC, VERSION, board.level, board.max_depth,
+                          len(used), board.size, x, y, len(structure),
+                          len(leaves))
+    palette = b''.join(bytes(PALETTE[index]) for index in used)
+    return (header + palette + _pack(structure, 1) +
+            _pack([local[index] for index in leaves], width))
+
+
+def _record_length(header: Tuple) -> int:
+    """Return the number of bytes after the header in the record with the
+    unpacked <header>.
+    """
+    _, _, _, _, num_colours, _, _, _, num_bits, num_leaves = header
+    return (3 * num_colours + _packed_length(num_bits, 1) +
+            _packed_length(num_leaves, _colour_width(num_colours)))
+
+
+def _check_header(header: Tuple) -> None:
+    """Raise a ValueError if <header> is not the header of a record in this
+    version of the format.
+    """
+    if header[0] != MAGIC:
+        raise ValueError('not a board record')
+    if header[1] != VERSION:
+        raise ValueError(f'unsupported board format version {header[1]}')
+
+
+def _decode(view: memoryview, offset: int) -> Tuple[Block, int]:
+    """Return the board in the record that starts at <offset> in <view>, and
+    the offset just past the end of that record.
+
+    Raise a ValueError if there is not a complete, valid record there, or if
+    the record uses a colour that is not in settings.PALETTE.
+    """
+    if len(view) - offset < _HEADER.size:
+        raise ValueError('truncated board record')
+    header = _HEADER.unpack_from(view, offset)
+    _check_header(header)
+    end = offset + _HEADER.size + _record_length(header)
+    if len(view) < end:
+        raise ValueError('truncated board record')
+    _, _, level, max_depth, num_colours, size, x, y, num_bits, num_leaves = \
+        header
+
+    offset += _HEADER.size
+    palette = [tuple(view[i:i + 3]) for i in range(offset,
+                                                   offset + 3 * num_colours,
+                                                   3)]
+    offset += 3 * num_colours
+    structure_length = _packed_length(num_bits, 1)
+    structure = iter(_unpack(view[offset:offset + structure_length],
+                             num_bits, 1))
+    offset += structure_length
+    colours = iter(_unpack(view[offset:end], num_leaves,
+                           _colour_width(num_colours)))
+
+    try:
+        board = _build((x, y), size, level, max_depth, palette, structure,
+                       colours)
+    except (StopIteration, IndexError):
+        raise ValueError('corrupt board record')
+    return board, end
+
+
+def _build(position: Tuple[int, int], size: int, level: int, max_depth: int,
+           palette: List[Tuple[int, int, int]], structure: Iterator[int],
+           colours: Iterator[int]) -> Block:
+    """Return the block at <position> whose structure bits and colours come
+    next from <structure> and <colours>.
+    """
+    if level != max_depth and next(structure):
+        block = Block(position, size, None, level, max_depth)
+        size_of_child = child_size(size)
+        # The children's positions are worked out from their parent, so it
+        # does not matter where they are created.
+        block.children = [_build((0, 0), size_of_child, level + 1,
+                                 max_depth, palette, structure, colours)
+                          for _ in range(4)]
+        return block
+    else:
+        return Block(position, size, palette[next(colours)], level,
+                     max_depth)
+
+
+def loads(data: Buffer) -> Block:
+    """Return the board in the record at the start of <data>.
+
+    <data> is read through a memoryview, so a record in a bytearray or an
+    mmap is decoded without being copied first.
+
+    >>> board = Block((0, 0), 750, PALETTE[0], 0, 1)
+    >>> board.smash()
+    True
+    >>> loads(dumps(board)) == board
+    True
+
+    Loading a board never adds colours to settings.PALETTE, so a record that
+    uses any other colour cannot be loaded:
+
+    >>> record = bytearray(dumps(board))
+    >>> record[_HEADER.size:_HEADER.size + 3] = bytes((1, 2, 3))
+    >>> loads(record)
+    Traceback (most recent call last):
+    ...
+    ValueError: (1, 2, 3) is not in the palette
+    """
+    with memoryview(data) as view:
+        return _decode(view, 0)[0]
+
+
+def iter_loads(data: Buffer) -> Iterator[Block]:
+    """Yield the boards in the records stored one after another in <data>.
+
+    >>> board = Block((0, 0), 750, PALETTE[0], 0, 1)
+    >>> boards = list(iter_loads(dumps(board) * 3))
+    >>> len(boards)
+    3
+    """
+    with memoryview(data) as view:
+        offset = 0
+        while offset < len(view):
+            board, offset = _decode(view, offset)
+            yield board
+
+
+def dump(board: Block, file: BinaryIO) -> None:
+    """Write <board> to <file> as one record.
+    """
+    file.write(dumps(board))
+
+
+def load(file: BinaryIO) -> Block:
+    """Read the next record from <file> and return its board.
+
+    Raise an EOFError if <file> has no more records, and a ValueError if
+    the next record is not complete and valid, or uses a colour that is not
+    in settings.PALETTE.
+    """
+    header_bytes = file.read(_HEADER.size)
+    if len(header_bytes) == 0:
+        raise EOFError('no more board records')
+    if len(header_bytes) < _HEADER.size:
+        raise ValueError('truncated board record')
+    header = _HEADER.unpack(header_bytes)
+    _check_header(header)
+    record = header_bytes + file.read(_record_length(header))
+    return _decode(memoryview(record), 0)[0]
+
+
+def iter_load(file: BinaryIO) -> Iterator[Block]:
+    """Yield the boards in the records in <file>, until the end of <file>.
+    """
+    while True:
+        try:
+            board = load(file)
+        except EOFError:
+            return
+        yield board
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config={
+        'allowed-io': ['dump', 'load'],
+        'allowed-import-modules': [
+            'doctest', 'python_ta', 'typing', '__future__', 'mmap', 'struct',
+            'block', 'settings'
+        ],
+        'max-args': 7,
+        'max-locals': 20
+    })